@@ -30,6 +30,12 @@ CHUNK_SIZE = 100  # Process papers in chunks for large collections
 ENABLE_CACHING = True  # Cache search results for better performance
 BATCH_INDEXING = True  # Rebuild index in batches instead of after each import
 
+# External metadata lookups (Crossref, DOAJ, ISSN Portal)
+API_CACHE_DIR = DATA_DIR / "api_cache"  # Persistent cache (needs diskcache)
+API_CACHE_TTL_DAYS = 60  # Re-fetch cached records after this many days
+API_CACHE_MEMORY_SIZE = 4096  # In-process entries kept per cache
+SCHOLAR_BLOCK_STATE_PATH = DATA_DIR / "scholar_block.json"  # Google Scholar captcha cooldown, shared across restarts
+
 
 def ensure_directories_exist() -> None:
 	DATA_DIR.mkdir(parents=True, exist_ok=True)
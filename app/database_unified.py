@@ -38,6 +38,9 @@ class UnifiedDatabaseManager:
         self.dsn = dsn or POSTGRES_DSN
         self.engine = None
         self.session_factory = None
+        # Bumped after every committed write to the paper tables, so readers
+        # can tell whether data they cached is still current
+        self.data_version = 0
         self._setup_database()
     
     def _setup_database(self):
@@ -278,6 +281,10 @@ class UnifiedDatabaseManager:
         """Get database session."""
         return self.session_factory()
     
+    def mark_changed(self):
+        """Record that paper data changed (invalidates readers' caches)."""
+        self.data_version += 1
+    
     def close(self):
         """Close database connections."""
         if self.engine:
@@ -287,6 +294,17 @@ class UnifiedDatabaseManager:
 class UnifiedPaperRepository:
     """Unified paper repository with normalized data access."""
     
+    # Paper, metadata and citation columns returned by search queries
+    # (the verification columns only exist in the Postgres schema)
+    _SEARCH_COLUMNS = """p.id, p.title, p.authors, p.year, p.abstract, p.doi, p.journal, p.publisher,
+                               p.file_path, p.full_text, p.is_duplicate, p.duplicate_of_id, p.similarity_score,""" + ("""
+                               p.verification_status, p.verification_method, p.verification_confidence,
+                               p.verification_date, p.last_verification_attempt,""" if DB_BACKEND == "postgres" else "") + """
+                               pm.department, pm.research_domain, pm.paper_type, pm.student, pm.review_status,
+                               pm.indexing_status, pm.issn, pm.published_month,
+                               cd.citation_count, cd.scimago_quartile, cd.impact_factor, cd.h_index,
+                               cd.citation_source, cd.citation_updated_at"""
+    
     def __init__(self, db_manager: UnifiedDatabaseManager):
         self.db_manager = db_manager
     
@@ -363,6 +381,7 @@ class UnifiedPaperRepository:
                 self._insert_citation_data(session, paper_id, paper_data)
                 
                 session.commit()
+                self.db_manager.mark_changed()
                 return paper_id
                 
             except Exception as e:
@@ -465,14 +484,7 @@ class UnifiedPaperRepository:
                 
                 if DB_BACKEND == "postgres":
                     sql = f"""
-                        SELECT p.id, p.title, p.authors, p.year, p.abstract, p.doi, p.journal, p.publisher,
-                               p.file_path, p.full_text, p.is_duplicate, p.duplicate_of_id, p.similarity_score,
-                               p.verification_status, p.verification_method, p.verification_confidence, 
-                               p.verification_date, p.last_verification_attempt,
-                               pm.department, pm.research_domain, pm.paper_type, pm.student, pm.review_status, 
-                               pm.indexing_status, pm.issn, pm.published_month,
-                               cd.citation_count, cd.scimago_quartile, cd.impact_factor, cd.h_index, 
-                               cd.citation_source, cd.citation_updated_at,
+                        SELECT {self._SEARCH_COLUMNS},
                                ts_rank(p.search_vector, plainto_tsquery('english', :query)) as rank
                         FROM papers_unified p
                         LEFT JOIN paper_metadata pm ON p.id = pm.paper_id
@@ -483,12 +495,7 @@ class UnifiedPaperRepository:
                     """
                 else:
                     sql = f"""
-                        SELECT p.id, p.title, p.authors, p.year, p.abstract, p.doi, p.journal, p.publisher,
-                               p.file_path, p.full_text, p.is_duplicate, p.duplicate_of_id, p.similarity_score,
-                               pm.department, pm.research_domain, pm.paper_type, pm.student, pm.review_status, 
-                               pm.indexing_status, pm.issn, pm.published_month,
-                               cd.citation_count, cd.scimago_quartile, cd.impact_factor, cd.h_index, 
-                               cd.citation_source, cd.citation_updated_at
+                        SELECT {self._SEARCH_COLUMNS}
                         FROM papers_unified p
                         LEFT JOIN paper_metadata pm ON p.id = pm.paper_id
                         LEFT JOIN citation_data cd ON p.id = cd.paper_id
@@ -501,28 +508,82 @@ class UnifiedPaperRepository:
                 rows = result.fetchall()
                 
                 # Convert to dictionaries
-                papers = []
-                for row in rows:
-                    paper_dict = dict(row._mapping)
-                    
-                    # Handle None values for numeric fields that might be used in comparisons
-                    if paper_dict.get('citation_count') is None:
-                        paper_dict['citation_count'] = 0
-                    if paper_dict.get('impact_factor') is None:
-                        paper_dict['impact_factor'] = 0.0
-                    if paper_dict.get('h_index') is None:
-                        paper_dict['h_index'] = 0
-                    if paper_dict.get('verification_confidence') is None:
-                        paper_dict['verification_confidence'] = 0.0
-                    
-                    papers.append(paper_dict)
-                
-                return papers
+                return [self._row_to_paper(row) for row in rows]
                 
             except Exception as e:
                 logger.error(f"Error searching papers: {e}")
                 return []
     
+    def keyword_search(self, query: str, limit: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Case-insensitive substring search ranked inside the database.
+        
+        A paper scores 2.0 when the query occurs in its title, plus 1.0 for the
+        abstract and 0.5 each for authors and journal; only papers scoring
+        above zero are returned, best first.
+        
+        Case folding is done by the database: Postgres ILIKE folds all
+        letters, but SQLite's LIKE only folds ASCII letters, so on SQLite
+        non-ASCII text (e.g. "É" vs "é") matches case-sensitively.
+        
+        Args:
+            query: Search query (matched literally, % and _ included)
+            limit: Maximum number of results
+            
+        Returns:
+            List of (paper dictionary, score) tuples
+        """
+        with self.db_manager.get_session() as session:
+            try:
+                # Escape LIKE wildcards so the query is matched as plain text
+                escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                params = {'pattern': f"%{escaped}%", 'limit': limit}
+                
+                like = "ILIKE" if DB_BACKEND == "postgres" else "LIKE"
+                
+                sql = f"""
+                    SELECT * FROM (
+                        SELECT {self._SEARCH_COLUMNS},
+                               (CASE WHEN p.title {like} :pattern ESCAPE '\\' THEN 2.0 ELSE 0.0 END
+                                + CASE WHEN p.abstract {like} :pattern ESCAPE '\\' THEN 1.0 ELSE 0.0 END
+                                + CASE WHEN p.authors {like} :pattern ESCAPE '\\' THEN 0.5 ELSE 0.0 END
+                                + CASE WHEN p.journal {like} :pattern ESCAPE '\\' THEN 0.5 ELSE 0.0 END) AS keyword_score
+                        FROM papers_unified p
+                        LEFT JOIN paper_metadata pm ON p.id = pm.paper_id
+                        LEFT JOIN citation_data cd ON p.id = cd.paper_id
+                    ) ranked
+                    WHERE keyword_score > 0
+                    ORDER BY keyword_score DESC, year DESC
+                    LIMIT :limit
+                """
+                
+                results = []
+                for row in session.execute(text(sql), params):
+                    paper_dict = self._row_to_paper(row)
+                    results.append((paper_dict, float(paper_dict.pop('keyword_score'))))
+                return results
+                
+            except Exception as e:
+                logger.error(f"Error in keyword search: {e}")
+                return []
+    
+    @staticmethod
+    def _row_to_paper(row) -> Dict[str, Any]:
+        """Convert a result row to a paper dictionary."""
+        paper_dict = dict(row._mapping)
+        
+        # Handle None values for numeric fields that might be used in comparisons
+        if paper_dict.get('citation_count') is None:
+            paper_dict['citation_count'] = 0
+        if paper_dict.get('impact_factor') is None:
+            paper_dict['impact_factor'] = 0.0
+        if paper_dict.get('h_index') is None:
+            paper_dict['h_index'] = 0
+        if paper_dict.get('verification_confidence') is None:
+            paper_dict['verification_confidence'] = 0.0
+        
+        return paper_dict
+    
     def get_paper_by_id(self, paper_id: int) -> Optional[Dict[str, Any]]:
         """Get paper by ID with all related data."""
         with self.db_manager.get_session() as session:
@@ -620,6 +681,7 @@ class UnifiedPaperRepository:
                     self._update_within_session(session, paper_id, verified_metadata)
                 
                 session.commit()
+                self.db_manager.mark_changed()
                 return True
             except OperationalError as e:
                 session.rollback()
@@ -933,6 +995,7 @@ class UnifiedPaperRepository:
                     """), updates)
                 
                 session.commit()
+                self.db_manager.mark_changed()
                 return True
             except OperationalError as e:
                 session.rollback()
@@ -1006,6 +1069,7 @@ class UnifiedPaperRepository:
                 # Reuse helper to perform updates without committing
                 self._update_within_session(session, paper_id, updates)
                 session.commit()
+                self.db_manager.mark_changed()
                 return True
             except OperationalError as e:
                 session.rollback()
@@ -1038,6 +1102,7 @@ class UnifiedPaperRepository:
                 # Check if any rows were affected
                 if result.rowcount > 0:
                     session.commit()
+                    self.db_manager.mark_changed()
                     return True
                 else:
                     logger.warning(f"Paper {paper_id} not found for deletion")
@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 import json
+from dataclasses import asdict
 from datetime import datetime
 
 from PySide6.QtWidgets import (
@@ -80,8 +81,8 @@ class PDFProcessingThread(QThread):
                 self.progress_updated.emit(f"Processing {Path(file_path).name}...", i, total_files)
                 
                 try:
-                    # Extract metadata
-                    metadata = extract_paper_metadata(file_path)
+                    # Extract metadata (full text is not kept by the import dialog)
+                    metadata = extract_paper_metadata(file_path, need_full_text=False)
                     
                     # Enrich metadata
                     enriched = enrich_paper_metadata(
@@ -757,7 +758,7 @@ class EnhancedMainWindow(QMainWindow):
             if result['success']:
                 # Show correction dialog
                 dialog = MetadataCorrectionDialog(
-                    result['extracted'].__dict__,
+                    asdict(result['extracted']),
                     result['enriched'].__dict__,
                     self
                 )
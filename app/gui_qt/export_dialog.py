@@ -294,7 +294,7 @@ class ExportDialog(QDialog):
             # Load departments
             from ..utils.department_manager import get_all_departments
             departments = get_all_departments()
-            self.department_filter.addItems(["All"] + departments)
+            self.department_filter.addItems(["All", *departments])
         except Exception as e:
             logger.error(f"Error loading departments: {e}")
             self.department_filter.addItems([
@@ -0,0 +1,94 @@
+"""
+API Response Cache
+Caches successful Crossref/ISSN lookups keyed by DOI/ISSN, in process and on
+disk, so re-processing the same papers does not repeat network requests.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+from ..config import API_CACHE_DIR, API_CACHE_TTL_DAYS, API_CACHE_MEMORY_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class APICache:
+    """Two-level cache: a bounded in-memory LRU in front of an optional diskcache store."""
+    
+    def __init__(self, namespace: str, maxsize: int = API_CACHE_MEMORY_SIZE,
+                 ttl_days: float = API_CACHE_TTL_DAYS):
+        """
+        Initialize cache.
+        
+        Args:
+            namespace: Subdirectory of API_CACHE_DIR holding this cache
+            maxsize: Maximum number of entries kept in memory
+            ttl_days: Lifetime of persisted entries
+        """
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_days * 86400
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        self._disk_opened = False
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        
+        disk = self._get_disk()
+        if disk is None:
+            return None
+        
+        try:
+            value = disk.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading cache entry {key}: {e}")
+            return None
+        
+        if value is not None:
+            self._remember(key, value)
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key in memory and on disk."""
+        self._remember(key, value)
+        
+        disk = self._get_disk()
+        if disk is not None:
+            try:
+                disk.set(key, value, expire=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Error writing cache entry {key}: {e}")
+    
+    def _get_disk(self):
+        """Open the persistent store on first use (nothing is created on import)."""
+        if not self._disk_opened:
+            with self._lock:
+                if not self._disk_opened:
+                    if HAS_DISKCACHE:
+                        try:
+                            self._disk = diskcache.Cache(str(API_CACHE_DIR / self.namespace))
+                        except Exception as e:
+                            logger.warning(f"Persistent {self.namespace} cache unavailable: {e}")
+                    self._disk_opened = True
+        return self._disk
+    
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
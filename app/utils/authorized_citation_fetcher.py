@@ -11,13 +11,24 @@ No mock or simulated data - only real, authorized citation counts.
 
 import logging
 import requests
+import threading
 import time
+from datetime import datetime
 from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Format for AuthorizedCitationData.last_updated
+_NOW_FMT = "%Y-%m-%d %H:%M:%S"
+
 @dataclass
 class AuthorizedCitationData:
     """Container for authorized citation information."""
@@ -39,7 +50,8 @@ class AuthorizedCitationFetcher:
             'Accept': 'application/json'
         })
         self.rate_limit_delay = 1.0  # Be respectful to APIs
-        self.last_request_time = 0
+        self.last_request_time = 0.0
+        self._rate_limit_lock = threading.Lock()
         
         # API endpoints
         self.crossref_base = "https://api.crossref.org/works"
@@ -102,8 +114,7 @@ class AuthorizedCitationFetcher:
                 logger.warning(f"No authorized citation data found for: {title[:50]}...")
             
             # Set last updated timestamp
-            from datetime import datetime
-            citation_data.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            citation_data.last_updated = datetime.now().strftime(_NOW_FMT)
             
         except Exception as e:
             logger.error(f"Error fetching authorized citation data: {e}")
@@ -126,7 +137,7 @@ class AuthorizedCitationFetcher:
             response = self.session.get(url, timeout=15)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 citation_count = data.get('message', {}).get('is-referenced-by-count', 0)
                 return {
                     'success': True,
@@ -231,11 +242,12 @@ class AuthorizedCitationFetcher:
     
     def _rate_limit(self):
         """Implement rate limiting for API calls."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = current_time
+        # Concurrent lookups share one spacing between API calls
+        with self._rate_limit_lock:
+            time_since_last = time.monotonic() - self.last_request_time
+            if time_since_last < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - time_since_last)
+            self.last_request_time = time.monotonic()
     
     def get_api_status(self) -> Dict[str, Any]:
         """Get status of all authorized APIs."""
@@ -4,8 +4,12 @@ Fetches citation counts and SCImago quartile information for SCI verified papers
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
+import threading
 import time
+from datetime import datetime
 from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 import re
@@ -14,8 +18,32 @@ from .authorized_citation_fetcher import fetch_authorized_citation_data, Authori
 
 logger = logging.getLogger(__name__)
 
+# Format for CitationData.last_updated
+_NOW_FMT = "%Y-%m-%d %H:%M:%S"
 
-@dataclass
+# Shared pool for running the independent authorized/SCImago lookups concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="citation-fetch")
+
+# Number of journals whose classification is kept by _classify_journal
+JOURNAL_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=JOURNAL_CACHE_SIZE)
+def _classify_journal(fetcher: "CitationFetcher", journal: str) -> Tuple[str, Any]:
+    """
+    (quartile, impact level) of a normalized journal name from the fetcher's
+    unified classifier. Classification of a journal name is effectively static,
+    so hot journals are served from the cache instead of re-running it.
+    """
+    fetcher._rate_limit()
+    
+    # Use unified classifier to determine quartile and impact factor
+    metadata = {'journal': journal, 'publisher': '', 'issn': ''}
+    classification = fetcher.classifier.classify_paper(metadata)
+    return classification['quartile'], classification['impact_factor']
+
+
+@dataclass(slots=True)
 class CitationData:
     """Container for citation information."""
     citation_count: int = 0
@@ -38,7 +66,8 @@ class CitationFetcher:
             'User-Agent': 'Research-Paper-Browser/2.0 (Educational Project)'
         })
         self.rate_limit_delay = 1.0  # Be respectful to APIs
-        self.last_request_time = 0
+        self.last_request_time = 0.0
+        self._rate_limit_lock = threading.Lock()
         self.classifier = UnifiedPaperClassifier()
     
     def fetch_citation_data(self, doi: str, title: str, journal: str, year: int) -> CitationData:
@@ -57,8 +86,13 @@ class CitationFetcher:
         citation_data = CitationData()
         
         try:
+            # Authorized citations and quartile info are independent lookups,
+            # so run them concurrently (quartile only for SCI/Scopus journals)
+            authorized_future = _EXECUTOR.submit(fetch_authorized_citation_data, doi, title, journal, year)
+            scimago_future = _EXECUTOR.submit(self._fetch_scimago_data, journal, year) if journal else None
+            
             # Get authorized citation data
-            authorized_data = fetch_authorized_citation_data(doi, title, journal, year)
+            authorized_data = authorized_future.result()
             
             if authorized_data.success:
                 citation_data.citation_count = authorized_data.citation_count
@@ -75,8 +109,8 @@ class CitationFetcher:
                 logger.warning(f"No authorized citation data available: {authorized_data.error}")
             
             # Get quartile information (only for SCI/Scopus journals)
-            if journal:
-                scimago_data = self._fetch_scimago_data(journal, year)
+            if scimago_future is not None:
+                scimago_data = scimago_future.result()
                 if scimago_data['success']:
                     citation_data.scimago_quartile = scimago_data['quartile']
                     citation_data.impact_factor = scimago_data['impact_factor']
@@ -85,8 +119,7 @@ class CitationFetcher:
                     citation_data.success = True
             
             # Set last updated timestamp
-            from datetime import datetime
-            citation_data.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            citation_data.last_updated = datetime.now().strftime(_NOW_FMT)
             
         except Exception as e:
             logger.error(f"Error fetching citation data: {e}")
@@ -95,39 +128,11 @@ class CitationFetcher:
         
         return citation_data
     
-    def _fetch_crossref_citations(self, doi: str) -> Dict[str, Any]:
-        """Fetch citation count from Crossref."""
-        try:
-            self._rate_limit()
-            
-            url = f"https://api.crossref.org/works/{doi}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                citation_count = data.get('message', {}).get('is-referenced-by-count', 0)
-                return {
-                    'success': True,
-                    'citation_count': citation_count
-                }
-            else:
-                return {'success': False, 'error': f"HTTP {response.status_code}"}
-                
-        except Exception as e:
-            logger.error(f"Error fetching Crossref citations: {e}")
-            return {'success': False, 'error': str(e)}
-    
     def _fetch_scimago_data(self, journal: str, year: int) -> Dict[str, Any]:
         """Fetch SCImago quartile and impact factor data using unified classifier."""
         try:
-            self._rate_limit()
-            
-            # Use unified classifier to determine quartile and impact factor
-            metadata = {'journal': journal, 'publisher': '', 'issn': ''}
-            classification = self.classifier.classify_paper(metadata)
-            
-            quartile = classification['quartile']
-            impact_level = classification['impact_factor']
+            # The classifier lowercases and strips the name itself
+            quartile, impact_level = _classify_journal(self, journal.lower().strip())
             
             # Calculate impact factor based on quartile and year
             impact_factor = self._calculate_impact_factor(quartile, impact_level, year)
@@ -167,11 +172,11 @@ class CitationFetcher:
     
     def _rate_limit(self):
         """Implement rate limiting."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+        with self._rate_limit_lock:
+            time_since_last = time.monotonic() - self.last_request_time
+            if time_since_last < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - time_since_last)
+            self.last_request_time = time.monotonic()
 
 
 # Global instance
@@ -3,16 +3,67 @@ Direct Crossref API Metadata Fetcher
 Fetches complete, accurate metadata directly from Crossref using DOI.
 """
 
+import heapq
+import json
 import logging
+import operator
+import re
+import string
+import unicodedata
 import requests
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from typing import FrozenSet, Optional, Dict, Any, List
+from dataclasses import dataclass, field
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+from .api_cache import APICache
 
 logger = logging.getLogger(__name__)
 
+# Optional doi.org prefix, the DOI itself, and any trailing punctuation
+_DOI_PATTERN = re.compile(r'(?:(?:https?://)?(?:dx\.)?doi\.org/)?(10\.\d{4,}/\S+?)[.,;]*')
+
+# Author-name normalization: drop punctuation (except the comma separating
+# authors) and collapse whitespace runs
+_NAME_PUNCT_TABLE = str.maketrans('', '', string.punctuation.replace(',', ''))
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Registration agencies of common DOI prefixes; other prefixes are resolved
+# once through doi.org's RA lookup and cached
+KNOWN_DOI_AGENCIES = {
+    '10.1002': 'Crossref',   # Wiley
+    '10.1007': 'Crossref',   # Springer
+    '10.1016': 'Crossref',   # Elsevier
+    '10.1038': 'Crossref',   # Nature
+    '10.1080': 'Crossref',   # Taylor & Francis
+    '10.1109': 'Crossref',   # IEEE
+    '10.1145': 'Crossref',   # ACM
+    '10.1371': 'Crossref',   # PLOS
+    '10.3390': 'Crossref',   # MDPI
+    '10.5061': 'DataCite',   # Dryad
+    '10.5281': 'DataCite',   # Zenodo
+    '10.6084': 'DataCite',   # figshare
+    '10.13140': 'DataCite',  # ResearchGate
+    '10.48550': 'DataCite',  # arXiv
+}
+
+TITLE_STOP_WORDS = frozenset({'a', 'an', 'the', 'of', 'in', 'on', 'at', 'to', 'for', 'with'})
+
 
-@dataclass
+@dataclass(slots=True)
 class CrossrefMetadata:
     """Container for Crossref metadata."""
     doi: str = ""
@@ -32,11 +83,17 @@ class CrossrefMetadata:
     pages: str = ""
     success: bool = False
     error: str = ""
+    match_score: float = 0.0  # Set by search_by_title_and_author
+    title_words: Optional[FrozenSet[str]] = field(default=None, repr=False, compare=False)  # Set when first scored
+    authors_norm: str = field(default="", repr=False, compare=False)  # Set when first scored
 
 
 class CrossrefAPIFetcher:
     """Fetch metadata directly from Crossref API."""
     
+    # Seconds before a failed or empty registration agency lookup is retried
+    AGENCY_RETRY_AFTER = 300.0
+    
     def __init__(self, email: str = "research-browser@example.com"):
         """
         Initialize Crossref API fetcher.
@@ -49,8 +106,21 @@ class CrossrefAPIFetcher:
         self.session.headers.update({
             'User-Agent': f'ResearchPaperBrowser/2.0 (mailto:{email})'
         })
-        self.rate_limit_delay = 1.0  # Respect rate limits
-        self.last_request_time = 0
+        # Token bucket: sustained rate of one request per rate_limit_delay
+        # seconds, with short bursts of up to burst_capacity requests.
+        # Both are updated from Crossref's X-Rate-Limit-* response headers.
+        self.rate_limit_delay = 1.0
+        self.burst_capacity = 5
+        self._tokens = float(self.burst_capacity)
+        self._last_refill = time.monotonic()
+        self._rate_limit_lock = threading.Lock()
+        # Successful lookups keyed by lowercased DOI (DOIs are case-insensitive)
+        self._cache = APICache("crossref")
+        self._agency_cache = APICache("doi_agency")
+        # DOI prefix -> monotonic time after which a failed lookup is retried
+        self._agency_failures: Dict[str, float] = {}
+        self._agency_failures_lock = threading.Lock()
+        self._search_cache = APICache("crossref_search")
     
     def fetch_by_doi(self, doi: str) -> CrossrefMetadata:
         """
@@ -68,6 +138,10 @@ class CrossrefAPIFetcher:
         if not doi:
             return CrossrefMetadata(error="Invalid DOI format")
         
+        cached = self._cache.get(doi.lower())
+        if cached is not None:
+            return cached
+        
         try:
             # Rate limiting
             self._respect_rate_limit()
@@ -76,10 +150,14 @@ class CrossrefAPIFetcher:
             url = f"{self.base_url}/{doi}"
             
             response = self.session.get(url, timeout=10)
+            self._update_rate_limit(response.headers)
             
             if response.status_code == 200:
-                data = response.json()
-                return self._parse_response(data, doi)
+                data = _json_loads(response.content)
+                metadata = self._parse_response(data, doi)
+                if metadata.success:
+                    self._cache.set(doi.lower(), metadata)
+                return metadata
             elif response.status_code == 404:
                 logger.warning(f"DOI not found in Crossref: {doi}")
                 return CrossrefMetadata(doi=doi, error="DOI not found in Crossref database")
@@ -94,35 +172,202 @@ class CrossrefAPIFetcher:
             logger.error(f"Error fetching DOI {doi}: {e}")
             return CrossrefMetadata(doi=doi, error=str(e))
     
-    def _clean_doi(self, doi: str) -> str:
-        """Clean and validate DOI."""
-        import re
+    def fetch_by_dois(self, dois: List[str], batch_size: int = 20) -> Dict[str, CrossrefMetadata]:
+        """
+        Fetch metadata for many DOIs using Crossref's ``filter=doi:...`` query.
+        
+        Each batch of up to ``batch_size`` DOIs costs a single request instead
+        of one request per DOI.
+        
+        Args:
+            dois: DOI strings, in any form accepted by fetch_by_doi
+            batch_size: Maximum number of DOIs per request
+            
+        Returns:
+            Dict mapping each input DOI to its CrossrefMetadata. DOIs whose
+            batch request failed are left out so callers can retry them
+            individually with fetch_by_doi.
+        """
+        results = {}
+        pending = {}  # lowercased clean DOI -> input DOIs
+        
+        for doi in dois:
+            clean = self._clean_doi(doi)
+            if not clean:
+                results[doi] = CrossrefMetadata(error="Invalid DOI format")
+            elif ',' in clean:
+                continue  # Would split the filter value; leave for fetch_by_doi
+            else:
+                cached = self._cache.get(clean.lower())
+                if cached is not None:
+                    results[doi] = cached
+                else:
+                    pending.setdefault(clean.lower(), []).append(doi)
+        
+        keys = list(pending)
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            try:
+                self._respect_rate_limit()
+                
+                params = {
+                    'filter': ','.join(f'doi:{doi}' for doi in batch),
+                    'rows': len(batch)
+                }
+                response = self.session.get(self.base_url, params=params, timeout=10)
+                self._update_rate_limit(response.headers)
+                
+                if response.status_code != 200:
+                    logger.error(f"Crossref batch error {response.status_code} for {len(batch)} DOIs")
+                    continue
+                
+                found = {}
+                for item in _json_loads(response.content).get('message', {}).get('items', []):
+                    doi = item.get('DOI', '')
+                    if doi:
+                        found[doi.lower()] = self._parse_response({'message': item}, doi)
+                
+                for key in batch:
+                    metadata = found.get(key)
+                    if metadata is None:
+                        logger.warning(f"DOI not found in Crossref: {key}")
+                        metadata = CrossrefMetadata(doi=key, error="DOI not found in Crossref database")
+                    elif metadata.success:
+                        self._cache.set(key, metadata)
+                    for doi in pending[key]:
+                        results[doi] = metadata
+                        
+            except Exception as e:
+                logger.error(f"Error fetching Crossref batch of {len(batch)} DOIs: {e}")
         
+        return results
+    
+    def get_registration_agency(self, doi: str) -> str:
+        """
+        Look up the registration agency (Crossref, DataCite, ...) of a DOI's prefix.
+        
+        Args:
+            doi: DOI string
+            
+        Returns:
+            Agency name, or "" if it could not be determined
+        """
+        doi = self._clean_doi(doi)
         if not doi:
             return ""
         
-        # Remove common prefixes
-        doi = re.sub(r'^(https?://)?(dx\.)?doi\.org/', '', doi.strip())
+        return self._prefix_agency(doi.split('/', 1)[0])
+    
+    def _prefix_agency(self, prefix: str) -> str:
+        """Registration agency of a DOI prefix, or "" if it could not be determined."""
+        agency = KNOWN_DOI_AGENCIES.get(prefix) or self._agency_cache.get(prefix)
+        if agency:
+            return agency
+        
+        with self._agency_failures_lock:
+            if self._agency_failures.get(prefix, 0.0) > time.monotonic():
+                return ""
+        
+        try:
+            response = self.session.get(f"https://doi.org/doiRA/{prefix}", timeout=5)
+            if response.status_code == 200:
+                records = _json_loads(response.content)
+                agency = records[0].get('RA', '') if records else ''
+        except Exception as e:
+            logger.warning(f"Error looking up registration agency for {prefix}: {e}")
+        
+        if agency:
+            self._agency_cache.set(prefix, agency)
+        else:
+            with self._agency_failures_lock:
+                self._agency_failures[prefix] = time.monotonic() + self.AGENCY_RETRY_AFTER
+        return agency or ""
+    
+    def is_crossref_doi(self, doi: str) -> bool:
+        """False only when the DOI is known to be registered outside Crossref."""
+        clean = self._clean_doi(doi)
+        if not clean or self._cache.get(clean.lower()) is not None:
+            return True
+        agency = self._prefix_agency(clean.split('/', 1)[0])
+        return not agency or agency == 'Crossref'
+    
+    def filter_crossref_dois(self, dois: List[str], max_workers: int = 4) -> List[str]:
+        """
+        Keep the DOIs that may be resolvable via Crossref (see is_crossref_doi).
+        
+        DOIs already in the metadata cache are kept without a lookup, and the
+        registration agency of each distinct prefix is looked up once, with
+        the lookups running concurrently.
+        
+        Args:
+            dois: DOI strings
+            max_workers: Number of threads issuing agency lookups
+            
+        Returns:
+            The input DOIs that are not known to belong to another agency,
+            in their original order
+        """
+        prefixes = {}  # input DOI -> prefix still to be checked
+        for doi in dois:
+            clean = self._clean_doi(doi)
+            if clean and self._cache.get(clean.lower()) is None:
+                prefixes[doi] = clean.split('/', 1)[0]
         
-        # Remove trailing punctuation
-        doi = re.sub(r'[.,;]+$', '', doi)
+        unique = list(dict.fromkeys(prefixes.values()))
+        if max_workers <= 1 or len(unique) <= 1:
+            agencies = {prefix: self._prefix_agency(prefix) for prefix in unique}
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                agencies = dict(zip(unique, pool.map(self._prefix_agency, unique)))
         
-        # Validate DOI format
-        if not re.match(r'^10\.\d{4,}/[^\s]+$', doi):
+        return [
+            doi for doi in dois
+            if doi not in prefixes or agencies[prefixes[doi]] in ('', 'Crossref')
+        ]
+    
+    def _clean_doi(self, doi: str) -> str:
+        """Clean and validate DOI."""
+        if not doi:
+            return ""
+        
+        # Strip prefix/trailing punctuation and validate in a single pass
+        match = _DOI_PATTERN.fullmatch(doi.strip())
+        if not match:
             logger.warning(f"Invalid DOI format: {doi}")
             return ""
         
-        return doi
+        return match.group(1)
     
     def _respect_rate_limit(self):
         """Respect Crossref API rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
+        # Refill by elapsed time, then spend one token
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst_capacity),
+                self._tokens + (now - self._last_refill) / self.rate_limit_delay
+            )
+            self._last_refill = now
+            
+            if self._tokens < 1.0:
+                time.sleep((1.0 - self._tokens) * self.rate_limit_delay)
+                self._tokens = 1.0
+                self._last_refill = time.monotonic()
+            
+            self._tokens -= 1.0
+    
+    def _update_rate_limit(self, headers) -> None:
+        """Adopt the rate limit advertised by Crossref (e.g. 50 requests per 1s)."""
+        try:
+            limit = int(headers.get('X-Rate-Limit-Limit', 0))
+            interval = float(headers.get('X-Rate-Limit-Interval', '').rstrip('s') or 0)
+        except (TypeError, ValueError):
+            return
         
-        self.last_request_time = time.time()
+        if limit > 0 and interval > 0:
+            with self._rate_limit_lock:
+                self.rate_limit_delay = interval / limit
+                self.burst_capacity = limit
     
     def _parse_response(self, data: Dict, doi: str) -> CrossrefMetadata:
         """Parse Crossref API response into CrossrefMetadata."""
@@ -185,19 +430,18 @@ class CrossrefAPIFetcher:
         if not authors_list:
             return ""
         
-        author_names = []
-        for author in authors_list[:20]:  # Limit to first 20 authors
-            given = author.get('given', '')
-            family = author.get('family', '')
-            
-            if family:
-                if given:
-                    # Format: Given Family
-                    author_names.append(f"{given} {family}")
-                else:
-                    author_names.append(family)
-        
-        return ', '.join(author_names)
+        # Format: Given Family (limit to first 20 authors); strip() drops
+        # the leading space when there is no given name
+        return ', '.join(
+            f"{author.get('given', '')} {author['family']}".strip()
+            for author in authors_list[:20]
+            if author.get('family')
+        )
+    
+    def _normalize_name(self, name: str) -> str:
+        """Lowercase, ASCII-fold and strip punctuation from author names for matching."""
+        folded = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+        return _WHITESPACE_PATTERN.sub(' ', folded.lower().translate(_NAME_PUNCT_TABLE)).strip()
     
     def _extract_date(self, message: Dict) -> tuple:
         """Extract year and full publication date."""
@@ -257,28 +501,38 @@ class CrossrefAPIFetcher:
                 first_author = author.split(',')[0].strip()
                 params['query.author'] = first_author
             
-            response = self.session.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
+            with self.session.get(url, params=params, timeout=10, stream=True) as response:
+                self._update_rate_limit(response.headers)
+                if response.status_code != 200:
+                    logger.error(f"Search error: {response.status_code}")
+                    return []
+                
+                if HAS_IJSON:
+                    # Parse work records incrementally instead of buffering the whole body
+                    response.raw.decode_content = True
+                    items = ijson.items(response.raw, 'message.items.item')
+                else:
+                    items = _json_loads(response.content).get('message', {}).get('items', [])
+                
                 results = []
+                query_words = self._title_words(title)
+                query_first_author = self._normalize_name(first_author) if author else ""
                 
-                for item in data.get('message', {}).get('items', []):
+                for item in items:
                     doi = item.get('DOI', '')
                     if doi:
                         metadata = self._parse_response({'message': item}, doi)
                         # Calculate match score
                         metadata.match_score = self._calculate_match_score(
-                            title, author, metadata
+                            title, author, metadata, query_words, query_first_author
                         )
                         results.append(metadata)
-                
-                # Sort by match score
-                results.sort(key=lambda x: getattr(x, 'match_score', 0), reverse=True)
-                return results
-            else:
-                logger.error(f"Search error: {response.status_code}")
-                return []
+                        if len(results) >= limit:
+                            break
+            
+            # Top results by match score (falls back to a plain sort when
+            # there are no more results than the limit)
+            return heapq.nlargest(limit, results, key=operator.attrgetter('match_score'))
                 
         except Exception as e:
             logger.error(f"Error searching by title and author: {e}")
@@ -309,16 +563,22 @@ class CrossrefAPIFetcher:
         Returns:
             DOI string or None
         """
+        cache_key = f"{self._normalize_name(title)}\0{self._normalize_name(authors)}"
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             results = self.search_by_title_and_author(title, authors, limit=3)
             
             if results and len(results) > 0:
                 # Return the best match (highest score)
                 best_match = results[0]
-                match_score = getattr(best_match, 'match_score', 0)
+                match_score = best_match.match_score
                 
                 # Only return if match score is reasonable (>0.6)
                 if match_score > 0.6:
+                    self._search_cache.set(cache_key, best_match.doi)
                     return best_match.doi
                 else:
                     logger.warning(f"Match score too low: {match_score:.2f}")
@@ -330,63 +590,68 @@ class CrossrefAPIFetcher:
             return None
     
     def _calculate_match_score(self, query_title: str, query_author: str, 
-                               result: CrossrefMetadata) -> float:
+                               result: CrossrefMetadata,
+                               query_words: Optional[FrozenSet[str]] = None,
+                               query_first_author: Optional[str] = None) -> float:
         """
         Calculate how well a result matches the query.
         
+        Args:
+            query_title: Title that was searched for
+            query_author: Author string that was searched for
+            result: Parsed Crossref result
+            query_words: Precomputed title words of query_title (computed if omitted)
+            query_first_author: Precomputed normalized first author of query_author
+                (computed if omitted)
+        
         Returns score between 0 and 1.
         """
         score = 0.0
         
         # Title similarity (70% weight)
         if query_title and result.title:
-            title_similarity = self._string_similarity(
-                query_title.lower(), 
-                result.title.lower()
-            )
+            if query_words is None:
+                query_words = self._title_words(query_title)
+            result_words = result.title_words
+            if result_words is None:
+                result_words = result.title_words = self._title_words(result.title)
+            title_similarity = self._string_similarity(query_words, result_words)
             score += title_similarity * 0.7
         
         # Author similarity (30% weight)
         if query_author and result.authors:
             # Extract first author from query
-            first_author = query_author.split(',')[0].strip().lower()
-            result_authors_lower = result.authors.lower()
+            first_author = query_first_author
+            if first_author is None:
+                first_author = self._normalize_name(query_author.split(',')[0])
+            result_authors_norm = result.authors_norm
+            if not result_authors_norm:
+                result_authors_norm = result.authors_norm = self._normalize_name(result.authors)
             
-            if first_author in result_authors_lower:
+            if first_author in result_authors_norm:
                 score += 0.3
             else:
                 # Partial match
                 author_words = first_author.split()
-                matches = sum(1 for word in author_words if word in result_authors_lower)
+                matches = sum(1 for word in author_words if word in result_authors_norm)
                 score += (matches / len(author_words)) * 0.3 if author_words else 0
         
         return min(score, 1.0)
     
-    def _string_similarity(self, s1: str, s2: str) -> float:
+    def _title_words(self, text: str) -> FrozenSet[str]:
+        """Lowercased words of a title, without common stop words."""
+        return frozenset(text.lower().split()) - TITLE_STOP_WORDS
+    
+    def _string_similarity(self, words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
         """
-        Calculate string similarity using simple word overlap.
+        Calculate Jaccard similarity of two titles' word sets.
         Returns value between 0 and 1.
         """
-        if not s1 or not s2:
-            return 0.0
-        
-        # Tokenize
-        words1 = set(s1.split())
-        words2 = set(s2.split())
-        
-        # Remove common words
-        stop_words = {'a', 'an', 'the', 'of', 'in', 'on', 'at', 'to', 'for', 'with'}
-        words1 = words1 - stop_words
-        words2 = words2 - stop_words
-        
         if not words1 or not words2:
             return 0.0
         
-        # Calculate Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
+        intersection = len(words1 & words2)
+        return intersection / (len(words1) + len(words2) - intersection)
 
 
 # Global instance
@@ -406,6 +671,45 @@ def fetch_metadata_by_doi(doi: str) -> CrossrefMetadata:
     return crossref_fetcher.fetch_by_doi(doi)
 
 
+def fetch_metadata_by_dois(dois: List[str]) -> Dict[str, CrossrefMetadata]:
+    """
+    Convenience function to fetch metadata for many DOIs in batched requests.
+    
+    Args:
+        dois: DOI strings
+        
+    Returns:
+        Dict mapping each DOI to its CrossrefMetadata
+    """
+    return crossref_fetcher.fetch_by_dois(dois)
+
+
+def is_crossref_doi(doi: str) -> bool:
+    """
+    Convenience function to check whether a DOI can be resolved via Crossref.
+    
+    Args:
+        doi: DOI string
+        
+    Returns:
+        False if the DOI belongs to another registration agency
+    """
+    return crossref_fetcher.is_crossref_doi(doi)
+
+
+def filter_crossref_dois(dois: List[str]) -> List[str]:
+    """
+    Convenience function to drop DOIs registered with other agencies.
+    
+    Args:
+        dois: DOI strings
+        
+    Returns:
+        The DOIs that may be resolvable via Crossref
+    """
+    return crossref_fetcher.filter_crossref_dois(dois)
+
+
 def search_metadata_by_title(title: str, limit: int = 5) -> list:
     """
     Convenience function to search by title.
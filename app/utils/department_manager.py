@@ -3,20 +3,215 @@ Department Manager
 Manages predefined engineering departments and allows custom department addition.
 """
 
+import bisect
+import heapq
 import logging
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+import operator
+import sys
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Any, List, Dict, Mapping, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+_BY_NAME_KEY = operator.attrgetter('name')
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class DepartmentInfo:
     """Information about a department."""
     name: str
     code: str
     category: str
     description: str
+    # Lowercased name/code/description, NUL-separated so a query cannot match
+    # across field boundaries; used by search_departments
+    _haystack: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Intern the lookup keys so index hits and equality checks can
+        # short-circuit on identity
+        object.__setattr__(self, 'name', sys.intern(self.name))
+        object.__setattr__(self, 'code', sys.intern(self.code))
+        object.__setattr__(self, 'category', sys.intern(self.category))
+        object.__setattr__(self, '_haystack', f"{self.name}\0{self.code}\0{self.description}".lower())
+
+
+# Predefined engineering departments, built once at import time and shared
+# by every DepartmentManager
+_PREDEFINED_DEPARTMENTS: Tuple[DepartmentInfo, ...] = (
+    DepartmentInfo(
+        name="Civil Engineering",
+        code="CE",
+        category="Engineering",
+        description="Infrastructure, construction, and structural engineering"
+    ),
+    DepartmentInfo(
+        name="Mechanical Engineering", 
+        code="ME",
+        category="Engineering",
+        description="Mechanical systems, thermodynamics, and manufacturing"
+    ),
+    DepartmentInfo(
+        name="Electrical & Electronics Engineering",
+        code="EEE", 
+        category="Engineering",
+        description="Electrical systems, power, and electronics"
+    ),
+    DepartmentInfo(
+        name="Electronics & Communication Engineering",
+        code="ECE",
+        category="Engineering", 
+        description="Electronics, telecommunications, and signal processing"
+    ),
+    DepartmentInfo(
+        name="Computer Science & Engineering",
+        code="CSE",
+        category="Engineering",
+        description="Computer science, software engineering, and algorithms"
+    ),
+    DepartmentInfo(
+        name="Electronics & Instrumentation Engineering",
+        code="EIE",
+        category="Engineering",
+        description="Electronics, instrumentation, and control systems"
+    ),
+    DepartmentInfo(
+        name="Information Science & Engineering",
+        code="ISE",
+        category="Engineering",
+        description="Information systems, databases, and software development"
+    ),
+    DepartmentInfo(
+        name="Artificial Intelligence & Machine Learning",
+        code="AIML",
+        category="Engineering",
+        description="AI, machine learning, deep learning, and data science"
+    ),
+    # Additional common departments
+    DepartmentInfo(
+        name="Chemical Engineering",
+        code="CHE",
+        category="Engineering",
+        description="Chemical processes, materials, and industrial chemistry"
+    ),
+    DepartmentInfo(
+        name="Aerospace Engineering",
+        code="AE",
+        category="Engineering", 
+        description="Aircraft, spacecraft, and aerodynamics"
+    ),
+    DepartmentInfo(
+        name="Biomedical Engineering",
+        code="BME",
+        category="Engineering",
+        description="Medical devices, healthcare technology, and bioengineering"
+    ),
+    DepartmentInfo(
+        name="Environmental Engineering",
+        code="ENV",
+        category="Engineering",
+        description="Environmental systems, sustainability, and pollution control"
+    ),
+    DepartmentInfo(
+        name="Industrial Engineering",
+        code="IE",
+        category="Engineering",
+        description="Operations research, manufacturing, and systems optimization"
+    ),
+    DepartmentInfo(
+        name="Materials Science & Engineering",
+        code="MSE",
+        category="Engineering",
+        description="Materials properties, nanotechnology, and advanced materials"
+    ),
+    DepartmentInfo(
+        name="Mining Engineering",
+        code="MIN",
+        category="Engineering",
+        description="Mining operations, mineral processing, and geological engineering"
+    ),
+    DepartmentInfo(
+        name="Petroleum Engineering",
+        code="PE",
+        category="Engineering",
+        description="Oil and gas extraction, drilling, and reservoir engineering"
+    ),
+    DepartmentInfo(
+        name="Textile Engineering",
+        code="TE",
+        category="Engineering",
+        description="Textile manufacturing, fibers, and textile technology"
+    ),
+    DepartmentInfo(
+        name="Agricultural Engineering",
+        code="AGE",
+        category="Engineering",
+        description="Agricultural machinery, irrigation, and food processing"
+    ),
+    DepartmentInfo(
+        name="Marine Engineering",
+        code="MAR",
+        category="Engineering",
+        description="Ship design, marine systems, and ocean engineering"
+    ),
+    DepartmentInfo(
+        name="Automotive Engineering",
+        code="AUTO",
+        category="Engineering",
+        description="Vehicle design, automotive systems, and transportation"
+    ),
+    # Non-engineering departments
+    DepartmentInfo(
+        name="Mathematics",
+        code="MATH",
+        category="Science",
+        description="Pure and applied mathematics, statistics, and operations research"
+    ),
+    DepartmentInfo(
+        name="Physics",
+        code="PHY",
+        category="Science", 
+        description="Theoretical and applied physics, quantum mechanics, and optics"
+    ),
+    DepartmentInfo(
+        name="Chemistry",
+        code="CHEM",
+        category="Science",
+        description="Organic, inorganic, physical chemistry, and materials chemistry"
+    ),
+    DepartmentInfo(
+        name="Biology",
+        code="BIO",
+        category="Science",
+        description="Molecular biology, genetics, ecology, and biotechnology"
+    ),
+    DepartmentInfo(
+        name="Management Studies",
+        code="MS",
+        category="Management",
+        description="Business administration, finance, marketing, and operations"
+    ),
+    DepartmentInfo(
+        name="Architecture",
+        code="ARCH",
+        category="Design",
+        description="Architectural design, urban planning, and building technology"
+    ),
+    DepartmentInfo(
+        name="Pharmacy",
+        code="PHARM",
+        category="Health Sciences",
+        description="Pharmaceutical sciences, drug development, and clinical pharmacy"
+    ),
+    DepartmentInfo(
+        name="Other",
+        code="OTHER",
+        category="General",
+        description="Other departments not listed above"
+    )
+)
 
 
 class DepartmentManager:
@@ -24,263 +219,101 @@ class DepartmentManager:
     
     def __init__(self):
         """Initialize with predefined engineering departments."""
-        self.departments = self._load_predefined_departments()
-        self.custom_departments = []  # For user-added departments
+        self.departments = _PREDEFINED_DEPARTMENTS
+        self.custom_departments: Dict[str, DepartmentInfo] = {}  # User-added departments by name
+        
+        # Name -> DepartmentInfo index over predefined and custom departments
+        self._by_name = {dept.name: dept for dept in self.departments}
+        
+        # Category -> departments index over predefined and custom departments,
+        # each list kept sorted by name
+        self._by_category: Dict[str, List[DepartmentInfo]] = defaultdict(list)
+        for dept in sorted(self.departments, key=_BY_NAME_KEY):
+            self._by_category[dept.category].append(dept)
+        
+        # Sorted name lists: predefined names never change, custom names are
+        # kept in order on insert so reads only need a merge
+        self._predef_names_sorted = sorted(dept.name for dept in self.departments)
+        self._custom_names_sorted: List[str] = []
+        
+        # Memoized immutable views; cleared whenever custom departments change
+        self._cache: Dict[str, Any] = {}
     
-    def _load_predefined_departments(self) -> List[DepartmentInfo]:
-        """Load predefined engineering departments."""
-        return [
-            DepartmentInfo(
-                name="Civil Engineering",
-                code="CE",
-                category="Engineering",
-                description="Infrastructure, construction, and structural engineering"
-            ),
-            DepartmentInfo(
-                name="Mechanical Engineering", 
-                code="ME",
-                category="Engineering",
-                description="Mechanical systems, thermodynamics, and manufacturing"
-            ),
-            DepartmentInfo(
-                name="Electrical & Electronics Engineering",
-                code="EEE", 
-                category="Engineering",
-                description="Electrical systems, power, and electronics"
-            ),
-            DepartmentInfo(
-                name="Electronics & Communication Engineering",
-                code="ECE",
-                category="Engineering", 
-                description="Electronics, telecommunications, and signal processing"
-            ),
-            DepartmentInfo(
-                name="Computer Science & Engineering",
-                code="CSE",
-                category="Engineering",
-                description="Computer science, software engineering, and algorithms"
-            ),
-            DepartmentInfo(
-                name="Electronics & Instrumentation Engineering",
-                code="EIE",
-                category="Engineering",
-                description="Electronics, instrumentation, and control systems"
-            ),
-            DepartmentInfo(
-                name="Information Science & Engineering",
-                code="ISE",
-                category="Engineering",
-                description="Information systems, databases, and software development"
-            ),
-            DepartmentInfo(
-                name="Artificial Intelligence & Machine Learning",
-                code="AIML",
-                category="Engineering",
-                description="AI, machine learning, deep learning, and data science"
-            ),
-            # Additional common departments
-            DepartmentInfo(
-                name="Chemical Engineering",
-                code="CHE",
-                category="Engineering",
-                description="Chemical processes, materials, and industrial chemistry"
-            ),
-            DepartmentInfo(
-                name="Aerospace Engineering",
-                code="AE",
-                category="Engineering", 
-                description="Aircraft, spacecraft, and aerodynamics"
-            ),
-            DepartmentInfo(
-                name="Biomedical Engineering",
-                code="BME",
-                category="Engineering",
-                description="Medical devices, healthcare technology, and bioengineering"
-            ),
-            DepartmentInfo(
-                name="Environmental Engineering",
-                code="ENV",
-                category="Engineering",
-                description="Environmental systems, sustainability, and pollution control"
-            ),
-            DepartmentInfo(
-                name="Industrial Engineering",
-                code="IE",
-                category="Engineering",
-                description="Operations research, manufacturing, and systems optimization"
-            ),
-            DepartmentInfo(
-                name="Materials Science & Engineering",
-                code="MSE",
-                category="Engineering",
-                description="Materials properties, nanotechnology, and advanced materials"
-            ),
-            DepartmentInfo(
-                name="Mining Engineering",
-                code="MIN",
-                category="Engineering",
-                description="Mining operations, mineral processing, and geological engineering"
-            ),
-            DepartmentInfo(
-                name="Petroleum Engineering",
-                code="PE",
-                category="Engineering",
-                description="Oil and gas extraction, drilling, and reservoir engineering"
-            ),
-            DepartmentInfo(
-                name="Textile Engineering",
-                code="TE",
-                category="Engineering",
-                description="Textile manufacturing, fibers, and textile technology"
-            ),
-            DepartmentInfo(
-                name="Agricultural Engineering",
-                code="AGE",
-                category="Engineering",
-                description="Agricultural machinery, irrigation, and food processing"
-            ),
-            DepartmentInfo(
-                name="Marine Engineering",
-                code="MAR",
-                category="Engineering",
-                description="Ship design, marine systems, and ocean engineering"
-            ),
-            DepartmentInfo(
-                name="Automotive Engineering",
-                code="AUTO",
-                category="Engineering",
-                description="Vehicle design, automotive systems, and transportation"
-            ),
-            # Non-engineering departments
-            DepartmentInfo(
-                name="Mathematics",
-                code="MATH",
-                category="Science",
-                description="Pure and applied mathematics, statistics, and operations research"
-            ),
-            DepartmentInfo(
-                name="Physics",
-                code="PHY",
-                category="Science", 
-                description="Theoretical and applied physics, quantum mechanics, and optics"
-            ),
-            DepartmentInfo(
-                name="Chemistry",
-                code="CHEM",
-                category="Science",
-                description="Organic, inorganic, physical chemistry, and materials chemistry"
-            ),
-            DepartmentInfo(
-                name="Biology",
-                code="BIO",
-                category="Science",
-                description="Molecular biology, genetics, ecology, and biotechnology"
-            ),
-            DepartmentInfo(
-                name="Management Studies",
-                code="MS",
-                category="Management",
-                description="Business administration, finance, marketing, and operations"
-            ),
-            DepartmentInfo(
-                name="Architecture",
-                code="ARCH",
-                category="Design",
-                description="Architectural design, urban planning, and building technology"
-            ),
-            DepartmentInfo(
-                name="Pharmacy",
-                code="PHARM",
-                category="Health Sciences",
-                description="Pharmaceutical sciences, drug development, and clinical pharmacy"
-            ),
-            DepartmentInfo(
-                name="Other",
-                code="OTHER",
-                category="General",
-                description="Other departments not listed above"
-            )
-        ]
+    def _invalidate_cache(self):
+        """Drop memoized views after the department set changes."""
+        self._cache.clear()
     
-    def get_all_departments(self) -> List[str]:
-        """Get list of all department names."""
-        all_departments = [dept.name for dept in self.departments]
-        all_departments.extend([dept.name for dept in self.custom_departments])
-        return sorted(all_departments)
+    def get_all_departments(self) -> Sequence[str]:
+        """Get all department names (an immutable, cached tuple)."""
+        if 'all' not in self._cache:
+            self._cache['all'] = tuple(heapq.merge(self._predef_names_sorted, self._custom_names_sorted))
+        return self._cache['all']
     
-    def get_predefined_departments(self) -> List[str]:
-        """Get list of predefined department names only."""
-        return [dept.name for dept in self.departments]
+    def get_predefined_departments(self) -> Sequence[str]:
+        """Get predefined department names only (an immutable, cached tuple)."""
+        if 'predefined' not in self._cache:
+            self._cache['predefined'] = tuple(dept.name for dept in self.departments)
+        return self._cache['predefined']
     
-    def get_departments_by_category(self, category: str) -> List[str]:
-        """Get departments by category."""
-        departments = [dept.name for dept in self.departments if dept.category == category]
-        departments.extend([dept.name for dept in self.custom_departments if dept.category == category])
-        return sorted(departments)
+    def get_departments_by_category(self, category: str) -> Sequence[str]:
+        """Get departments by category (an immutable, cached tuple)."""
+        key = f'cat:{category}'
+        if key not in self._cache:
+            self._cache[key] = tuple(dept.name for dept in self._by_category.get(category, ()))
+        return self._cache[key]
     
-    def get_categories(self) -> List[str]:
-        """Get list of all categories."""
-        categories = list(set(dept.category for dept in self.departments))
-        categories.extend([dept.category for dept in self.custom_departments])
-        return sorted(list(set(categories)))
+    def get_categories(self) -> Sequence[str]:
+        """Get all categories (an immutable, cached tuple)."""
+        if 'categories' not in self._cache:
+            self._cache['categories'] = tuple(sorted(self._by_category))
+        return self._cache['categories']
     
     def get_department_info(self, department_name: str) -> Optional[DepartmentInfo]:
         """Get information about a specific department."""
-        # Check predefined departments
-        for dept in self.departments:
-            if dept.name == department_name:
-                return dept
-        
-        # Check custom departments
-        for dept in self.custom_departments:
-            if dept.name == department_name:
-                return dept
-        
-        return None
+        return self._by_name.get(department_name)
     
     def validate_department(self, department_name: str) -> bool:
         """Check if a department name is valid."""
-        return department_name in self.get_all_departments()
+        return department_name in self._by_name
     
     def add_custom_department(self, name: str, code: str = "", category: str = "Custom", description: str = "") -> bool:
         """Add a custom department."""
-        try:
-            # Check if department already exists
-            if self.validate_department(name):
-                logger.warning(f"Department '{name}' already exists")
-                return False
-            
-            # Create new department
-            new_dept = DepartmentInfo(
-                name=name,
-                code=code or name[:3].upper(),
-                category=category,
-                description=description or f"Custom department: {name}"
-            )
-            
-            self.custom_departments.append(new_dept)
-            logger.info(f"Added custom department: {name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error adding custom department: {e}")
+        # Check if department already exists
+        if self.validate_department(name):
+            logger.warning(f"Department '{name}' already exists")
             return False
+        
+        # Create new department
+        new_dept = DepartmentInfo(
+            name=name,
+            code=code or name[:3].upper(),
+            category=category,
+            description=description or f"Custom department: {name}"
+        )
+        
+        self.custom_departments[name] = new_dept
+        self._by_name[name] = new_dept
+        bisect.insort(self._by_category[new_dept.category], new_dept, key=_BY_NAME_KEY)
+        bisect.insort(self._custom_names_sorted, name)
+        self._invalidate_cache()
+        logger.info(f"Added custom department: {name}")
+        return True
     
     def remove_custom_department(self, department_name: str) -> bool:
         """Remove a custom department (cannot remove predefined ones)."""
-        try:
-            for i, dept in enumerate(self.custom_departments):
-                if dept.name == department_name:
-                    del self.custom_departments[i]
-                    logger.info(f"Removed custom department: {department_name}")
-                    return True
-            
+        dept = self.custom_departments.pop(department_name, None)
+        if dept is None:
             logger.warning(f"Custom department '{department_name}' not found")
             return False
-            
-        except Exception as e:
-            logger.error(f"Error removing custom department: {e}")
-            return False
+        
+        self._by_name.pop(department_name, None)
+        self._by_category[dept.category].remove(dept)
+        if not self._by_category[dept.category]:
+            del self._by_category[dept.category]
+        self._custom_names_sorted.remove(department_name)
+        self._invalidate_cache()
+        logger.info(f"Removed custom department: {department_name}")
+        return True
     
     def get_department_code(self, department_name: str) -> str:
         """Get department code."""
@@ -297,69 +330,76 @@ class DepartmentManager:
         dept_info = self.get_department_info(department_name)
         return dept_info.description if dept_info else ""
     
+    def _get_search_haystack(self) -> Tuple[str, List[int], Sequence[str]]:
+        """
+        Join every department's haystack, in name order, into one string.
+        
+        Returns the joined string, the start offset of each department in it,
+        and the department names in the same order.
+        """
+        if 'haystack' not in self._cache:
+            names = self.get_all_departments()
+            starts = []
+            offset = 0
+            for name in names:
+                starts.append(offset)
+                offset += len(self._by_name[name]._haystack) + 1
+            joined = '\x01'.join(self._by_name[name]._haystack for name in names)
+            self._cache['haystack'] = (joined, starts, names)
+        return self._cache['haystack']
+    
     def search_departments(self, query: str) -> List[str]:
         """Search departments by name or code."""
         query_lower = query.lower()
-        matching_departments = []
+        if not query_lower:
+            return list(self.get_all_departments())
+        if '\0' in query_lower or '\x01' in query_lower:
+            return []
         
-        for dept in self.departments + self.custom_departments:
-            if (query_lower in dept.name.lower() or 
-                query_lower in dept.code.lower() or
-                query_lower in dept.description.lower()):
-                matching_departments.append(dept.name)
+        # One C-level find() over all departments; after each hit, resume at
+        # the next department so each name is reported once, in sorted order
+        joined, starts, names = self._get_search_haystack()
+        matching_departments = []
+        pos = joined.find(query_lower)
+        while pos != -1:
+            index = bisect.bisect_right(starts, pos) - 1
+            matching_departments.append(names[index])
+            if index + 1 == len(starts):
+                break
+            pos = joined.find(query_lower, starts[index + 1])
         
-        return sorted(matching_departments)
+        return matching_departments
     
-    def get_departments_for_dropdown(self) -> Dict[str, List[str]]:
-        """Get departments organized for dropdown display."""
-        result = {}
-        
-        for category in self.get_categories():
-            result[category] = self.get_departments_by_category(category)
-        
-        return result
+    def get_departments_for_dropdown(self) -> Mapping[str, Sequence[str]]:
+        """Get departments organized for dropdown display (a read-only, cached mapping)."""
+        if 'dropdown' not in self._cache:
+            result = {}
+            
+            for category in self.get_categories():
+                result[category] = self.get_departments_by_category(category)
+            
+            self._cache['dropdown'] = MappingProxyType(result)
+        return self._cache['dropdown']
     
     def get_statistics(self) -> Dict:
         """Get department statistics."""
         return {
-            "total_departments": len(self.get_all_departments()),
+            "total_departments": len(self._by_name),
             "predefined_departments": len(self.departments),
             "custom_departments": len(self.custom_departments),
-            "categories": len(self.get_categories()),
-            "engineering_departments": len(self.get_departments_by_category("Engineering")),
-            "science_departments": len(self.get_departments_by_category("Science")),
+            "categories": len(self._by_category),
+            "engineering_departments": len(self._by_category.get("Engineering", ())),
+            "science_departments": len(self._by_category.get("Science", ())),
         }
 
 
 # Global instance
 department_manager = DepartmentManager()
 
-
-def get_all_departments() -> List[str]:
-    """Get list of all department names."""
-    return department_manager.get_all_departments()
-
-
-def get_predefined_departments() -> List[str]:
-    """Get list of predefined department names only."""
-    return department_manager.get_predefined_departments()
-
-
-def get_departments_by_category(category: str) -> List[str]:
-    """Get departments by category."""
-    return department_manager.get_departments_by_category(category)
-
-
-def get_departments_for_dropdown() -> Dict[str, List[str]]:
-    """Get departments organized for dropdown display."""
-    return department_manager.get_departments_for_dropdown()
-
-
-def add_custom_department(name: str, code: str = "", category: str = "Custom", description: str = "") -> bool:
-    """Add a custom department."""
-    return department_manager.add_custom_department(name, code, category, description)
-
-
-def validate_department(department_name: str) -> bool:
-    """Check if a department name is valid."""
-    return department_manager.validate_department(department_name)
+# Module-level API, bound directly to the global instance's methods
+get_all_departments = department_manager.get_all_departments
+get_predefined_departments = department_manager.get_predefined_departments
+get_departments_by_category = department_manager.get_departments_by_category
+get_departments_for_dropdown = department_manager.get_departments_for_dropdown
+add_custom_department = department_manager.add_custom_department
+validate_department = department_manager.validate_department
@@ -4,10 +4,13 @@ Extracts structured metadata from research papers using PyMuPDF and regex patter
 """
 
 import re
+import sys
 import logging
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 try:
     import fitz  # PyMuPDF
@@ -16,7 +19,13 @@ except ImportError:
     HAS_PYMUPDF = False
 
 try:
-    from .crossref_fetcher import fetch_metadata_by_doi
+    import pcre2  # PCRE2 with JIT compilation
+    HAS_PCRE2 = True
+except ImportError:
+    HAS_PCRE2 = False
+
+try:
+    from .crossref_fetcher import crossref_fetcher, fetch_metadata_by_doi, fetch_metadata_by_dois, filter_crossref_dois, is_crossref_doi
     HAS_CROSSREF = True
 except ImportError:
     HAS_CROSSREF = False
@@ -63,7 +72,54 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _search_by_priority(pattern: re.Pattern, text: str, kinds: Tuple[str, ...],
+                        accept=None, endpos: int = sys.maxsize) -> Optional[str]:
+    """
+    Scan text once with a pattern of named alternatives and return the first
+    accepted match of the highest-priority kind (kinds are in priority order).
+    
+    Equivalent to searching with one pattern per kind, in order, but reads the
+    text only once. Only text[:endpos] is searched.
+    """
+    found = {}
+    for match in pattern.finditer(text, 0, endpos):
+        kind = match.lastgroup
+        if kind in found:
+            continue
+        value = match.group(kind)
+        if accept is not None and not accept(value):
+            continue
+        found[kind] = value
+        if kind == kinds[0]:
+            break
+    
+    for kind in kinds:
+        if kind in found:
+            return found[kind]
+    return None
+
+
+def _compile_jit(pattern: str, ignorecase: bool = False):
+    """
+    Compile a pattern with PCRE2 and JIT it when available, else with re.
+    
+    Used for the priority patterns and the month-year scan. PCRE2 treats
+    \\d, \\s, \\w and case folding as Unicode-aware like re, and its Pattern
+    supports the finditer(text, pos, endpos) / lastgroup calls used here.
+    """
+    if HAS_PCRE2:
+        compiled = pcre2.compile(pattern, pcre2.IGNORECASE if ignorecase else 0)
+        compiled.jit_compile()
+        return compiled
+    return re.compile(pattern, re.IGNORECASE if ignorecase else 0)
+
+
+def _contains_any(words: List[str]) -> re.Pattern:
+    """Compile a case-insensitive pattern matching any of the given substrings."""
+    return re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class ExtractedMetadata:
     """Container for extracted PDF metadata."""
     title: str = ""
@@ -78,53 +134,156 @@ class ExtractedMetadata:
     paper_type: str = ""  # Paper type (Journal Article, Conference Paper, etc.)
     indexing_status: str = ""  # SCI, Scopus, SCI + Scopus, Non-SCI/Non-Scopus
     research_domain: str = ""  # Automatically classified domain
-    keywords: List[str] = None
+    keywords: List[str] = field(default_factory=list)
     full_text: str = ""
     confidence: float = 0.0
-    
-    def __post_init__(self):
-        if self.keywords is None:
-            self.keywords = []
 
 
 class EnhancedPDFExtractor:
     """Enhanced PDF extractor using PyMuPDF for research papers."""
     
-    def __init__(self):
+    # Author-line validators (precompiled; run on every candidate line)
+    _URL_DOI_RE = re.compile(r'https?://|www\.|doi\.org|10\.\d{4,}/', re.IGNORECASE)
+    _DATE_RES = (
+        re.compile(r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}\b', re.IGNORECASE),
+        re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'),  # Dates like 12/31/2020
+        re.compile(r'\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b'),  # Dates like 2020-12-31
+    )
+    _EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+    _SUPERSCRIPT_NAME_RE = re.compile(r'[A-Z][a-z]+\s*[¹²³⁴⁵¹²³⁴⁵⁶⁷⁸⁹⁰\d]')
+    _NAME_RES = (
+        re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+'),  # First Last
+        re.compile(r'\b[A-Z][a-z]+,\s*[A-Z]'),  # Last, First
+        re.compile(r'\b[A-Z]\.\s*[A-Z]\.\s*[A-Z][a-z]+'),  # A. B. Last
+        re.compile(r'\b[A-Z][a-z]+\s+[A-Z]\.'),  # First L.
+        re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+'),  # First Middle Last
+    )
+    _NAME_PART_RE = re.compile(r'[A-Z][a-z]+\s+[A-Z]')
+    
+    # Substring blocklists, one alternation each instead of lower() + N scans
+    _TITLE_SKIP_RE = _contains_any(['page', 'doi:', 'abstract', 'keywords', 'introduction'])
+    _AUTHOR_LINE_SKIP_RE = _contains_any(['abstract', 'keywords', 'introduction', 'doi:', 'issn', 'volume', 'issue'])
+    _METADATA_KW_RE = _contains_any(['volume', 'issue', 'issn', 'copyright', '©', 'published', 'received'])
+    _EXPAND_STOP_RE = _contains_any(['abstract', 'keywords', 'introduction', 'university', 'department', 'email', '@', 'institute', 'college'])
+    _CAPTURE_STOP_RE = _contains_any(['abstract', 'keywords', 'introduction', 'email', '@', 'department', 'university', 'institute', 'college', 'school'])
+    _METADATA_PREFIX_RE = re.compile(r'volume|issue|page|doi|issn', re.IGNORECASE)  # use with .match()
+    _TITLE_KEYWORD_RE = _contains_any(['analysis', 'study', 'investigation', 'approach', 'method', 'system', 'using', 'based', 'application', 'development'])
+    _AUTHOR_INDICATOR_RE = _contains_any(['university', 'college', 'institute', 'department', 'lab', 'center', 'school', 'faculty'])
+    _AUTHOR_SKIP_RE = _contains_any(['copyright', 'volume', 'issue', 'journal', 'published', 'received', 'accepted', 'doi:', 'issn', 'http', 'www', '.com', '.org', '.edu'])
+    
+    # Local confidence at or above which Crossref/ISSN enrichment is skipped
+    LOCAL_CONFIDENCE_THRESHOLD = 0.9
+    # Threads overlapping the per-paper Crossref/ISSN round-trips in batches
+    REMOTE_WORKERS = 4
+    
+    # Abstract section patterns, tried in order. Matching is case-insensitive,
+    # so one pattern covers both "Abstract" and "ABSTRACT" headings.
+    _ABSTRACT_RES = (
+        re.compile(r'Abstract[:\s\-–]*\n(.*?)(?=\n\s*(?:Keywords?|Key\s+Words?|Introduction|1\.|I\.|Background|Methods|References?|©|\d+\.\s+Introduction))', re.DOTALL | re.IGNORECASE),
+        re.compile(r'Abstract[:\s\-–]+(.*?)(?=\n\n|Keywords?|Introduction)', re.DOTALL | re.IGNORECASE),
+    )
+    _WHITESPACE_RE = re.compile(r'\s+')
+    # "Page N" anywhere, or trailing digits (possibly around such page
+    # markers); same result as removing the markers first, then the digits
+    _ABSTRACT_CLEANUP_RE = re.compile(r'Page\s+\d+|\d+(?:\s|Page\s+\d+)*$')
+    
+    # Section patterns; searched with pos/endpos to bound them to the front
+    # matter without slicing the page text
+    # Author labels (priority order, see month_pattern). The alternatives
+    # start with different letters, so each position matches at most one.
+    _AUTHOR_LABEL_RE = re.compile(
+        r'(?=Author[s]?\s*[:\-–]\s*(?P<label>[^\n]+)'  # Single line after label
+        r'|By\s*[:\-–]?\s*(?P<by>[A-Z][^\n]+)'
+        r'|Written\s+by\s*[:\-–]?\s*(?P<written>[A-Z][^\n]+))',
+        re.IGNORECASE
+    )
+    _AUTHOR_LABEL_KINDS = ('label', 'by', 'written')
+    _ISSN_WORD_RE = re.compile('ISSN', re.IGNORECASE)  # Same case folding as the old label regex
+    _YEAR_MONTH_RE = _compile_jit(r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\s*[,\.]?\s*(19|20)\d{2}\b', ignorecase=True)
+    _NUMERIC_DATE_RES = (  # (required separator, pattern)
+        ('/', re.compile(r'\b(0?[1-9]|1[0-2])/(0?[1-9]|[12][0-9]|3[01])/(19|20)\d{2}\b')),  # MM/DD/YYYY
+        ('/', re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])/(0?[1-9]|1[0-2])/(19|20)\d{2}\b')),  # DD/MM/YYYY
+        ('-', re.compile(r'\b(19|20)\d{2}-(0?[1-9]|1[0-2])-(0?[1-9]|[12][0-9]|3[01])\b')),  # YYYY-MM-DD
+    )
+    _JOURNAL_INDICATOR_RES = (  # (required literals or None, pattern)
+        (None, re.compile(r'(?:Published\s+in|In)\s+([A-Z][^,\n]{10,80})')),
+        (('Conference', 'Workshop', 'Symposium'), re.compile(r'(?:Conference|Workshop|Symposium)\s+(?:on|of)\s+([A-Z][^,\n]{10,60})')),
+        (('Journal',), re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\s+Journal)')),
+    )
+    
+    # Author-string cleanup and line classification
+    _AUTHOR_LABEL_PREFIX_RE = re.compile(r'^(Author[s]?|By|Written\s+by)\s*:\s*', re.IGNORECASE)
+    _AFFILIATION_TAIL_RE = re.compile(r'\s+(Department|Institute|University|College|School|Faculty|Center|Centre).*$', re.IGNORECASE)
+    _CAPTURED_AFFILIATION_TAIL_RE = re.compile(r'\s+(Department|Institute|University|College|School).*$', re.IGNORECASE)
+    _INLINE_EMAIL_RE = re.compile(r'\s*[\w.+-]+@[\w-]+\.[\w.-]+\s*')
+    _TRAILING_NUMBER_MARKER_RE = re.compile(r'\s+\d+\s*$')
+    _CAPITALIZED_WORD_RE = re.compile(r'[A-Z][a-z]+')
+    _NAME_PAIR_RE = re.compile(r'[A-Z][a-z]+[,\s]+[A-Z]')
+    _CONTINUATION_RE = re.compile(r'^[a-z,]')
+    _JOURNAL_PREFIX_RE = re.compile(r'^(Journal|Proceedings|Conference)\s+', re.IGNORECASE)
+    _KEYWORD_SEPARATOR_RE = re.compile(r'[,;]')
+    
+    # Literal anchors required by doi_pattern, _ABSTRACT_RES and keywords_pattern
+    _ANCHOR_RE = re.compile(
+        r'(?P<doi>doi\.org)|(?P<abstract>abstract)|(?P<keywords>key\s*words?|index\s+terms?)',
+        re.IGNORECASE
+    )
+    _ANCHOR_KINDS = 3
+    
+    # Crossref fields merged into the extracted metadata: (field, only when
+    # longer than the extracted value); the others win whenever present
+    _CROSSREF_MERGE_RULES = (
+        ('title', True), ('authors', True), ('journal', False),
+        ('publisher', False), ('year', False), ('abstract', True),
+    )
+    
+    # Collapse whitespace and normalize ", " separators in one substitution
+    _SPACING_RE = re.compile(r'\s*,\s*|\s+')
+    
+    def __init__(self, use_crossref_search: bool = False):
+        """
+        Initialize extractor.
+        
+        Args:
+            use_crossref_search: Default for the Crossref title/author search
+                used when a PDF has no DOI (one slow query that rarely
+                finds a confident match); can be overridden per call
+        """
         if not HAS_PYMUPDF:
             raise ImportError("PyMuPDF (fitz) is required for enhanced PDF extraction")
         
+        self.use_crossref_search = use_crossref_search
+        
+        # Plain-text extraction flags: the default minus ligature and
+        # whitespace preservation, which only matter for faithful rendering
+        # and make the regex passes below see "ﬁ" or NBSP instead of "fi"/" "
+        self.text_flags = fitz.TEXTFLAGS_TEXT & ~(
+            fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE
+        )
+        
         # DOI pattern (fixed - removed extra parenthesis)
         self.doi_pattern = re.compile(
             r'(?:doi:|DOI:)?\s*(?:https?://)?(?:dx\.)?doi\.org/?(10\.\d{4,}/[^\s\)]+)',
             re.IGNORECASE
         )
         
-        # ISSN pattern
-        self.issn_pattern = re.compile(
-            r'\b(\d{4})-(\d{3}[\dXx])\b'
+        # Year pattern (4-digit years; also covers years in parentheses and ranges).
+        # Runs on an ASCII bytes copy of the text (see _extract_year): byte
+        # classes skip the Unicode lookups that dominate this findall
+        self.year_pattern = re.compile(rb'\b(?:19|20)\d{2}\b')
+        
+        # Month pattern: one alternation, one named group per kind, listed in
+        # priority order. The lookahead reports every position (like separate
+        # per-kind searches would) so _search_by_priority can rank the kinds.
+        self.month_pattern = _compile_jit(
+            r'(?=\b(?P<full>January|February|March|April|May|June|July|August|September|October|November|December)\b'
+            r'|\b(?P<abbr>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\b'
+            r'|\b(?P<number>0?[1-9]|1[0-2])\b'
+            r'|\b(?P<quarter>Q[1-4])\b'
+            r'|\b(?P<season>Spring|Summer|Fall|Autumn|Winter)\b)',
+            ignorecase=True
         )
-        
-        # Year patterns
-        self.year_patterns = [
-            re.compile(r'\b(19|20)\d{2}\b'),  # 4-digit years
-            re.compile(r'\((\d{4})\)'),  # Years in parentheses
-            re.compile(r'\b(19|20)\d{2}\s*[,\-–]\s*(19|20)\d{2}\b'),  # Year ranges
-        ]
-        
-        # Month patterns
-        self.month_patterns = [
-            # Full month names
-            re.compile(r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\b', re.IGNORECASE),
-            # Abbreviated month names
-            re.compile(r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\b', re.IGNORECASE),
-            # Month numbers
-            re.compile(r'\b(0?[1-9]|1[0-2])\b'),
-            # Quarters
-            re.compile(r'\b(Q[1-4])\b', re.IGNORECASE),
-            # Season patterns
-            re.compile(r'\b(Spring|Summer|Fall|Autumn|Winter)\b', re.IGNORECASE),
-        ]
+        self.month_kinds = ('full', 'abbr', 'number', 'quarter', 'season')
         
         # Month name mapping
         self.month_mapping = {
@@ -144,29 +303,38 @@ class EnhancedPDFExtractor:
             'spring': 'Spring', 'summer': 'Summer', 'fall': 'Fall', 'autumn': 'Autumn', 'winter': 'Winter'
         }
         
-        # Common journal patterns
-        self.journal_patterns = [
-            re.compile(r'Journal\s+of\s+([A-Z][^,\.]+)', re.IGNORECASE),
-            re.compile(r'Proceedings\s+of\s+([A-Z][^,\.]+)', re.IGNORECASE),
-            re.compile(r'IEEE\s+([A-Z][^,\.]+)', re.IGNORECASE),
-            re.compile(r'ACM\s+([A-Z][^,\.]+)', re.IGNORECASE),
-            re.compile(r'Nature\s+([A-Z][^,\.]+)', re.IGNORECASE),
-            re.compile(r'Science\s+([A-Z][^,\.]+)', re.IGNORECASE),
-        ]
-        
-        # Keywords patterns
-        self.keywords_patterns = [
-            re.compile(r'Keywords?:\s*([^\n]+)', re.IGNORECASE),
-            re.compile(r'Key\s+Words?:\s*([^\n]+)', re.IGNORECASE),
-            re.compile(r'Index\s+Terms?:\s*([^\n]+)', re.IGNORECASE),
-        ]
+        # Common journal patterns (priority order, see month_pattern)
+        self.journal_pattern = _compile_jit(
+            r'(?=(?P<journal>Journal\s+of\s+[A-Z][^,\.]+)'
+            r'|(?P<proceedings>Proceedings\s+of\s+[A-Z][^,\.]+)'
+            r'|(?P<ieee>IEEE\s+[A-Z][^,\.]+)'
+            r'|(?P<acm>ACM\s+[A-Z][^,\.]+)'
+            r'|(?P<nature>Nature\s+[A-Z][^,\.]+)'
+            r'|(?P<science>Science\s+[A-Z][^,\.]+))',
+            ignorecase=True
+        )
+        self.journal_kinds = ('journal', 'proceedings', 'ieee', 'acm', 'nature', 'science')
+        
+        # Keywords patterns (priority order, see month_pattern)
+        self.keywords_pattern = _compile_jit(
+            r'(?=Keywords?:\s*(?P<keywords>[^\n]+)'
+            r'|Key\s+Words?:\s*(?P<key_words>[^\n]+)'
+            r'|Index\s+Terms?:\s*(?P<index_terms>[^\n]+))',
+            ignorecase=True
+        )
+        self.keywords_kinds = ('keywords', 'key_words', 'index_terms')
 
-    def extract_metadata(self, file_path: str) -> ExtractedMetadata:
+    def extract_metadata(self, file_path: str, need_full_text: bool = True,
+                         use_crossref_search: Optional[bool] = None) -> ExtractedMetadata:
         """
         Extract comprehensive metadata from a research paper PDF.
         
         Args:
             file_path: Path to PDF file
+            need_full_text: Whether to decode every page into full_text; when
+                False only the first 3 pages are read and full_text stays empty
+            use_crossref_search: Search Crossref by title/authors when no DOI
+                is found (None = the extractor's default)
             
         Returns:
             ExtractedMetadata object with extracted information
@@ -175,64 +343,195 @@ class EnhancedPDFExtractor:
             raise FileNotFoundError(f"PDF file not found: {file_path}")
         
         try:
-            doc = fitz.open(file_path)
-            metadata = ExtractedMetadata()
-            
-            # Extract basic document metadata
-            self._extract_document_metadata(doc, metadata)
-            
-            # Extract full text first (needed for journal pattern matching)
-            full_text = ""
-            for page_num in range(min(3, len(doc))):  # First 3 pages for pattern matching
-                page = doc[page_num]
-                full_text += page.get_text() + "\n"
-            
-            # Try journal-specific patterns first (if available)
-            if HAS_JOURNAL_PATTERNS and full_text:
-                journal_data = self._extract_with_journal_patterns(full_text, metadata)
-                if journal_data:
-                    logger.info("Successfully extracted using journal-specific patterns")
-            
-            # Extract text from first few pages for title, authors, abstract (fallback)
-            self._extract_structured_content(doc, metadata)
-            
-            # If DOI found, fetch accurate metadata from Crossref
-            if metadata.doi and HAS_CROSSREF:
-                logger.info(f"DOI found: {metadata.doi}. Fetching from Crossref...")
-                self._enrich_from_crossref(metadata)
-            # If no DOI but have title and authors, try to find DOI via Crossref
-            elif metadata.title and metadata.authors and HAS_CROSSREF:
-                logger.info("No DOI found. Searching Crossref by title and authors...")
-                self._find_and_enrich_from_crossref(metadata)
-            # If still no metadata enrichment but have ISSN, validate via ISSN
-            elif metadata.issn and HAS_ISSN_VALIDATOR and metadata.confidence < 0.8:
-                logger.info(f"No DOI found. Validating journal via ISSN: {metadata.issn}...")
-                self._validate_with_issn(metadata)
+            metadata, page_texts, full_text = self._extract_local(file_path, need_full_text)
+            self._enrich_remote(metadata, use_crossref_search=use_crossref_search)
+            self._finalize_metadata(metadata, page_texts, full_text)
+            return metadata
             
-            # Extract full text
-            metadata.full_text = self._extract_full_text(doc)
+        except Exception as e:
+            logger.error(f"Error extracting metadata from {file_path}: {e}")
+            return ExtractedMetadata()
+
+    def extract_metadata_batch(self, file_paths: List[str], workers: int = 1,
+                               need_full_text: bool = True,
+                               use_crossref_search: Optional[bool] = None) -> List[ExtractedMetadata]:
+        """
+        Extract metadata from several PDFs, sharing Crossref round-trips.
+        
+        DOIs found in the PDFs are fetched from Crossref in batched requests
+        instead of one request per file, and the remaining per-paper lookups
+        (title search, ISSN validation) run on REMOTE_WORKERS threads;
+        everything else matches extract_metadata.
+        
+        Args:
+            file_paths: Paths to PDF files
+            workers: Number of processes for the CPU-bound text extraction
+                (PyMuPDF decoding and regex passes); 1 runs in-process
+            need_full_text: Whether to fill full_text (see extract_metadata)
+            use_crossref_search: See extract_metadata
             
-            # Detect paper type (using full text from first 3 pages)
-            if HAS_PAPER_TYPE_DETECTOR and full_text:
-                metadata.paper_type = self._detect_paper_type(full_text, metadata)
+        Returns:
+            ExtractedMetadata objects in the same order as file_paths
+            (empty metadata for files that failed)
+        """
+        if workers > 1 and len(file_paths) > 1:
+            chunksize = max(1, len(file_paths) // (4 * workers))
+            worker = partial(_extract_local_or_none, need_full_text=need_full_text)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                extracted = list(pool.map(worker, file_paths, chunksize=chunksize))
+        else:
+            extracted = [self._extract_local_or_none(file_path, need_full_text) for file_path in file_paths]
+        
+        prefetched = {}
+        if HAS_CROSSREF:
+            # Agency lookups skip cached DOIs and run once per distinct prefix
+            dois = filter_crossref_dois([
+                item[0].doi for item in extracted
+                if item is not None and item[0].doi
+                and self._calculate_local_confidence(item[0]) < self.LOCAL_CONFIDENCE_THRESHOLD
+            ])
+            if dois:
+                logger.info(f"Fetching {len(dois)} DOIs from Crossref in batches...")
+                prefetched = fetch_metadata_by_dois(dois)
+        
+        # Each paper's enrichment only touches its own metadata, so the
+        # network waits overlap; classification needs the enriched fields
+        # and runs afterwards
+        enrich = partial(self._enrich_remote_or_error, prefetched=prefetched,
+                         use_crossref_search=use_crossref_search)
+        pending = [item[0] if item is not None else None for item in extracted]
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=self.REMOTE_WORKERS) as pool:
+                errors = list(pool.map(enrich, pending))
+        else:
+            errors = [enrich(metadata) for metadata in pending]
+        
+        results = []
+        for file_path, item, error in zip(file_paths, extracted, errors):
+            if item is None:
+                results.append(ExtractedMetadata())
+                continue
             
-            # Determine indexing status (SCI, Scopus, etc.)
-            if HAS_INDEXING_VALIDATOR:
-                metadata.indexing_status = self._determine_indexing_status(metadata)
+            metadata, page_texts, full_text = item
+            try:
+                if error is not None:
+                    raise error
+                self._finalize_metadata(metadata, page_texts, full_text)
+                results.append(metadata)
+            except Exception as e:
+                logger.error(f"Error extracting metadata from {file_path}: {e}")
+                results.append(ExtractedMetadata())
+        
+        return results
+
+    def _enrich_remote_or_error(self, metadata: Optional[ExtractedMetadata], prefetched: Optional[Dict] = None,
+                                use_crossref_search: Optional[bool] = None) -> Optional[Exception]:
+        """_enrich_remote for batch use: return the exception instead of raising it."""
+        if metadata is None:
+            return None
+        try:
+            self._enrich_remote(metadata, prefetched, use_crossref_search)
+        except Exception as e:
+            return e
+        return None
+
+    def _extract_local_or_none(self, file_path: str, need_full_text: bool = True) -> Optional[Tuple]:
+        """_extract_local for batch use: log failures and return None."""
+        try:
+            if not Path(file_path).exists():
+                raise FileNotFoundError(f"PDF file not found: {file_path}")
+            return self._extract_local(file_path, need_full_text)
+        except Exception as e:
+            logger.error(f"Error extracting metadata from {file_path}: {e}")
+            return None
+
+    def _extract_local(self, file_path: str,
+                       need_full_text: bool = True) -> Tuple[ExtractedMetadata, Optional[List[str]], str]:
+        """
+        Run the offline extraction passes on a PDF.
+        
+        Returns:
+            (metadata, per-page texts or None when need_full_text is False,
+            text of the first 3 pages)
+        """
+        doc = fitz.open(file_path)
+        try:
+            metadata = ExtractedMetadata()
             
-            # Classify research domain
-            if (HAS_DOMAIN_ASSIGNER or HAS_DOMAIN_CLASSIFIER) and full_text:
-                metadata.research_domain = self._classify_research_domain(full_text, metadata)
+            # Extract basic document metadata
+            self._extract_document_metadata(doc, metadata)
             
-            # Calculate confidence based on extracted fields
-            metadata.confidence = self._calculate_confidence(metadata)
+            # Largest-font text on page 1 as the title candidate (needs the
+            # open document; applied after the journal-specific patterns)
+            font_title = ""
+            if not metadata.title and len(doc):
+                font_title = self._extract_title_from_fonts(doc[0])
             
+            # Decode every page once (or just the first 3 when full text is
+            # not wanted); all consumers below share these strings
+            page_texts = self._extract_page_texts(doc, None if need_full_text else 3)
+        finally:
             doc.close()
-            return metadata
-            
-        except Exception as e:
-            logger.error(f"Error extracting metadata from {file_path}: {e}")
-            return ExtractedMetadata()
+        
+        # First 3 pages for pattern matching (needed for journal pattern matching)
+        full_text = "".join(page_text + "\n" for page_text in page_texts[:3])
+        
+        # Try journal-specific patterns first (if available)
+        if HAS_JOURNAL_PATTERNS and full_text:
+            journal_data = self._extract_with_journal_patterns(full_text, metadata)
+            if journal_data:
+                logger.info("Successfully extracted using journal-specific patterns")
+        
+        # Extract text from first few pages for title, authors, abstract (fallback)
+        self._extract_structured_content(full_text, metadata, font_title)
+        
+        return metadata, page_texts if need_full_text else None, full_text
+
+    def _enrich_remote(self, metadata: ExtractedMetadata, prefetched: Optional[Dict] = None,
+                       use_crossref_search: Optional[bool] = None) -> None:
+        """Enrich metadata from Crossref/ISSN, using prefetched Crossref records when given."""
+        if use_crossref_search is None:
+            use_crossref_search = self.use_crossref_search
+        
+        # Skip the network-bound enrichment when the PDF text alone
+        # already produced every field it can provide
+        local_confidence = self._calculate_local_confidence(metadata)
+        if local_confidence >= self.LOCAL_CONFIDENCE_THRESHOLD:
+            logger.info(f"Local extraction complete ({local_confidence:.2f}); skipping Crossref/ISSN lookups")
+        # If DOI found (and registered with Crossref), fetch accurate metadata from Crossref
+        elif metadata.doi and HAS_CROSSREF and is_crossref_doi(metadata.doi):
+            logger.info(f"DOI found: {metadata.doi}. Fetching from Crossref...")
+            self._enrich_from_crossref(metadata, (prefetched or {}).get(metadata.doi))
+        # If no DOI but have title and authors, try to find DOI via Crossref
+        elif not metadata.doi and metadata.title and metadata.authors and HAS_CROSSREF and use_crossref_search:
+            logger.info("No DOI found. Searching Crossref by title and authors...")
+            self._find_and_enrich_from_crossref(metadata)
+        # If still no metadata enrichment but have ISSN, validate via ISSN
+        elif metadata.issn and HAS_ISSN_VALIDATOR and metadata.confidence < 0.8:
+            logger.info(f"No DOI found. Validating journal via ISSN: {metadata.issn}...")
+            self._validate_with_issn(metadata)
+
+    def _finalize_metadata(self, metadata: ExtractedMetadata, page_texts: Optional[List[str]],
+                           full_text: str) -> None:
+        """Assemble full text (unless page_texts is None) and run the classification passes."""
+        # Extract full text
+        if page_texts is not None:
+            metadata.full_text = self._extract_full_text(page_texts)
+        
+        # Detect paper type (using full text from first 3 pages)
+        if HAS_PAPER_TYPE_DETECTOR and full_text:
+            metadata.paper_type = self._detect_paper_type(full_text, metadata)
+        
+        # Determine indexing status (SCI, Scopus, etc.)
+        if HAS_INDEXING_VALIDATOR:
+            metadata.indexing_status = self._determine_indexing_status(metadata)
+        
+        # Classify research domain
+        if (HAS_DOMAIN_ASSIGNER or HAS_DOMAIN_CLASSIFIER) and full_text:
+            metadata.research_domain = self._classify_research_domain(full_text, metadata)
+        
+        # Calculate confidence based on extracted fields
+        metadata.confidence = self._calculate_confidence(metadata)
 
     def _extract_document_metadata(self, doc: fitz.Document, metadata: ExtractedMetadata) -> None:
         """Extract metadata from PDF document properties."""
@@ -268,8 +567,6 @@ class EnhancedPDFExtractor:
             True if successful extraction, False otherwise
         """
         try:
-            from .journal_patterns import journal_pattern_matcher
-            
             # Identify the journal
             journal_id = journal_pattern_matcher.identify_journal(text)
             
@@ -320,30 +617,36 @@ class EnhancedPDFExtractor:
             logger.error(f"Error extracting with journal patterns: {e}")
             return False
 
-    def _extract_structured_content(self, doc: fitz.Document, metadata: ExtractedMetadata) -> None:
-        """Extract structured content from first few pages."""
+    def _extract_structured_content(self, text_content: str, metadata: ExtractedMetadata,
+                                    font_title: str = "") -> None:
+        """
+        Extract structured content from the text of the first few pages.
+        
+        Args:
+            text_content: Text of the first few pages
+            metadata: ExtractedMetadata object to update
+            font_title: Largest-font text on page 1, preferred over the
+                first-lines title heuristic
+        """
         try:
-            # Process first 3 pages for title, authors, abstract
-            content_pages = min(3, len(doc))
-            text_content = ""
-            
-            for page_num in range(content_pages):
-                page = doc[page_num]
-                text_content += page.get_text() + "\n"
+            # One pass for the literal anchors the DOI, abstract and keyword
+            # patterns cannot match without; extractors whose anchor is absent
+            # are skipped instead of each scanning the text for nothing
+            anchors = self._find_anchors(text_content)
             
             # Extract title if not found in document metadata
             if not metadata.title:
-                metadata.title = self._extract_title(text_content)
+                metadata.title = font_title or self._extract_title(text_content)
             
             # Extract authors if not found in document metadata
             if not metadata.authors:
                 metadata.authors = self._extract_authors(text_content)
             
             # Extract abstract
-            metadata.abstract = self._extract_abstract(text_content)
+            metadata.abstract = self._extract_abstract(text_content) if 'abstract' in anchors else ""
             
             # Extract DOI
-            metadata.doi = self._extract_doi(text_content)
+            metadata.doi = self._extract_doi(text_content) if 'doi' in anchors else ""
             
             # Extract ISSN
             metadata.issn = self._extract_issn(text_content)
@@ -359,11 +662,58 @@ class EnhancedPDFExtractor:
                 metadata.journal = self._extract_journal(text_content)
             
             # Extract keywords
-            metadata.keywords = self._extract_keywords(text_content)
+            metadata.keywords = self._extract_keywords(text_content) if 'keywords' in anchors else []
             
         except Exception as e:
             logger.warning(f"Error extracting structured content: {e}")
 
+    def _find_anchors(self, text: str) -> set:
+        """Return which of the ANCHOR_RE kinds occur in text."""
+        found = set()
+        for match in self._ANCHOR_RE.finditer(text):
+            found.add(match.lastgroup)
+            if len(found) == self._ANCHOR_KINDS:
+                break
+        return found
+
+    def _extract_title_from_fonts(self, page: fitz.Page) -> str:
+        """Extract paper title as the largest-font text on the first page."""
+        try:
+            blocks = page.get_text("dict", flags=self.text_flags)["blocks"]
+        except Exception as e:
+            logger.warning(f"Error reading font information: {e}")
+            return ""
+        
+        spans = [
+            span
+            for block in blocks
+            for line in block.get("lines", ())
+            for span in line["spans"]
+            if span["text"].strip()
+        ]
+        if not spans:
+            return ""
+        
+        # Body size = the size carrying the most characters; a title must be larger
+        chars_by_size = {}
+        for span in spans:
+            size = round(span["size"], 1)
+            chars_by_size[size] = chars_by_size.get(size, 0) + len(span["text"])
+        body_size = max(chars_by_size, key=chars_by_size.get)
+        title_size = max(chars_by_size)
+        if title_size <= body_size:
+            return ""
+        
+        # A title may wrap over several lines set in the same size
+        title = " ".join(
+            " ".join(span["text"].split())
+            for span in spans
+            if round(span["size"], 1) == title_size
+        )
+        if 10 < len(title) < 300 and not self._TITLE_SKIP_RE.search(title):
+            return title
+        return ""
+
     def _extract_title(self, text: str) -> str:
         """Extract paper title from text."""
         lines = text.split('\n')
@@ -373,27 +723,24 @@ class EnhancedPDFExtractor:
             line = line.strip()
             if len(line) > 10 and len(line) < 200:  # Reasonable title length
                 # Skip lines that look like headers or page numbers
-                if not any(skip in line.lower() for skip in ['page', 'doi:', 'abstract', 'keywords', 'introduction']):
+                if not self._TITLE_SKIP_RE.search(line):
                     return line
         
         return ""
 
     def _extract_authors(self, text: str) -> str:
         """Extract authors from text - captures ALL authors including multi-line."""
-        lines = text.split('\n')
-        
-        # Try explicit author labels first (IJRASET and many journals use these)
-        author_label_patterns = [
-            r'Author[s]?\s*[:\-–]\s*([^\n]+)',  # Single line after label
-            r'By\s*[:\-–]?\s*([A-Z][^\n]+)',
-            r'Written\s+by\s*[:\-–]?\s*([A-Z][^\n]+)',
-        ]
+        # Try explicit author labels first (IJRASET and many journals use these).
+        # One scan collects the first match of each label kind.
+        first_matches = {}
+        for match in self._AUTHOR_LABEL_RE.finditer(text, 0, 1500):
+            first_matches.setdefault(match.lastgroup, match.group(match.lastgroup))
+            if len(first_matches) == len(self._AUTHOR_LABEL_KINDS):
+                break
         
-        first_1500 = text[:1500]
-        for pattern in author_label_patterns:
-            match = re.search(pattern, first_1500, re.IGNORECASE)
-            if match:
-                authors = match.group(1).strip()
+        for kind in self._AUTHOR_LABEL_KINDS:
+            if kind in first_matches:
+                authors = first_matches[kind].strip()
                 
                 # Validate: Skip if it contains dates, URLs, or DOIs
                 if self._is_invalid_author_string(authors):
@@ -408,7 +755,8 @@ class EnhancedPDFExtractor:
         # Look for author patterns in lines (WITHOUT multi-line expansion to avoid capturing titles)
         title_line = None
         
-        for i, line in enumerate(lines[:25]):  # Look in first 25 lines
+        lines = text.split('\n', 25)[:25]  # Look in first 25 lines
+        for i, line in enumerate(lines):
             line = line.strip()
             
             # Skip if too short or contains common non-author words
@@ -416,18 +764,19 @@ class EnhancedPDFExtractor:
                 continue
             
             # Skip explicit non-author content
-            if any(skip in line.lower() for skip in ['abstract', 'keywords', 'introduction', 'doi:', 'issn', 'volume', 'issue']):
+            if self._AUTHOR_LINE_SKIP_RE.search(line):
                 continue
             
             # Track likely title (usually appears before authors)
-            if not title_line and self._looks_like_title(line):
+            is_title = self._looks_like_title(line)
+            if not title_line and is_title:
                 title_line = i
                 continue
             
             # Check if line contains author-like patterns
-            if self._looks_like_authors(line) and not self._looks_like_title(line):
+            if not is_title and self._looks_like_authors(line):
                 # Only accept if it has clear author patterns (multiple names with commas)
-                if ',' in line and re.search(r'[A-Z][a-z]+', line):
+                if ',' in line and self._CAPITALIZED_WORD_RE.search(line):
                     authors = self._clean_author_string(line)
                     if authors:
                         return authors
@@ -450,8 +799,7 @@ class EnhancedPDFExtractor:
             return True
         
         # If it has title-like keywords
-        title_keywords = ['analysis', 'study', 'investigation', 'approach', 'method', 'system', 'using', 'based', 'application', 'development']
-        if any(keyword in line.lower() for keyword in title_keywords):
+        if self._TITLE_KEYWORD_RE.search(line):
             return True
         
         # If it's all caps and long (common title format)
@@ -466,20 +814,19 @@ class EnhancedPDFExtractor:
             return ""
         
         # Remove common prefixes/suffixes
-        authors = re.sub(r'^(Author[s]?|By|Written\s+by)\s*:\s*', '', authors, flags=re.IGNORECASE)
+        authors = self._AUTHOR_LABEL_PREFIX_RE.sub('', authors)
         
         # Remove institutional affiliations at the end
-        authors = re.sub(r'\s+(Department|Institute|University|College|School|Faculty|Center|Centre).*$', '', authors, flags=re.IGNORECASE)
+        authors = self._AFFILIATION_TAIL_RE.sub('', authors)
         
         # Remove email addresses
-        authors = re.sub(r'\s*[\w.+-]+@[\w-]+\.[\w.-]+\s*', ' ', authors)
+        authors = self._INLINE_EMAIL_RE.sub(' ', authors)
         
         # Remove numbers and superscripts at the end (but keep within names)
-        authors = re.sub(r'\s+\d+\s*$', '', authors)
+        authors = self._TRAILING_NUMBER_MARKER_RE.sub('', authors)
         
         # Clean up whitespace
-        authors = re.sub(r'\s+', ' ', authors)
-        authors = re.sub(r'\s*,\s*', ', ', authors)
+        authors = self._normalize_spacing(authors)
         
         authors = authors.strip()
         
@@ -493,28 +840,34 @@ class EnhancedPDFExtractor:
         
         return authors
     
+    def _normalize_spacing(self, text: str) -> str:
+        """Collapse whitespace runs to one space and comma runs to ', '."""
+        return self._SPACING_RE.sub(lambda m: ', ' if ',' in m.group() else ' ', text)
+    
+    def _count_alpha(self, text: str) -> Tuple[int, int]:
+        """Count (alphabetic, non-alphabetic non-space) characters in text."""
+        # map() over the str predicates runs the loop in C; same Unicode
+        # semantics as per-character isalpha()/isspace()
+        alpha = sum(map(str.isalpha, text))
+        space = sum(map(str.isspace, text))
+        return alpha, len(text) - alpha - space
+    
     def _is_invalid_author_string(self, text: str) -> bool:
         """Check if a string is NOT valid authors (e.g., dates, URLs, DOIs)."""
         if not text or len(text) < 3:
             return True
         
         # Check for URLs and DOIs
-        if re.search(r'https?://|www\.|doi\.org|10\.\d{4,}/', text, re.IGNORECASE):
+        if self._URL_DOI_RE.search(text):
             return True
         
         # Check for date patterns (month + year)
-        date_patterns = [
-            r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}\b',
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
-            r'\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b',
-        ]
-        for pattern in date_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in self._DATE_RES:
+            if pattern.search(text):
                 return True
         
         # Check if mostly non-alphabetic (probably metadata, not names)
-        alpha_count = sum(1 for c in text if c.isalpha())
-        non_alpha_count = sum(1 for c in text if not c.isalpha() and not c.isspace())
+        alpha_count, non_alpha_count = self._count_alpha(text)
         
         if alpha_count == 0:
             return True
@@ -525,8 +878,7 @@ class EnhancedPDFExtractor:
             return True
         
         # Check for common metadata keywords
-        metadata_keywords = ['volume', 'issue', 'issn', 'copyright', '©', 'published', 'received']
-        if any(keyword in text.lower() for keyword in metadata_keywords):
+        if self._METADATA_KW_RE.search(text):
             return True
         
         return False
@@ -546,14 +898,14 @@ class EnhancedPDFExtractor:
                 break
             
             # Skip the label line itself (e.g., "Authors:")
-            if first_line and re.match(r'^(Author[s]?|By|Written\s+by)\s*:', line, re.IGNORECASE):
+            if first_line and self._AUTHOR_LABEL_PREFIX_RE.match(line):
                 first_line = False
                 continue
             
             first_line = False
             
             # Stop if we hit non-author content
-            if any(stop in line.lower() for stop in ['abstract', 'keywords', 'introduction', 'university', 'department', 'email', '@', 'institute', 'college']):
+            if self._EXPAND_STOP_RE.search(line):
                 break
             
             # Stop if it's a title-like line (all capitals or very long)
@@ -565,9 +917,9 @@ class EnhancedPDFExtractor:
                 break
             
             # Check if line looks like authors (has proper names)
-            if re.search(r'[A-Z][a-z]+', line) and not line.lower().startswith(('volume', 'issue', 'page', 'doi', 'issn')):
+            if self._CAPITALIZED_WORD_RE.search(line) and not self._METADATA_PREFIX_RE.match(line):
                 # Only add if it has name-like patterns
-                if re.search(r'[A-Z][a-z]+[,\s]+[A-Z]', line):  # Has at least 2 name patterns
+                if self._NAME_PAIR_RE.search(line):  # Has at least 2 name patterns
                     authors_lines.append(line)
                 elif len(authors_lines) == 0:  # First line can be more lenient
                     authors_lines.append(line)
@@ -604,7 +956,7 @@ class EnhancedPDFExtractor:
                 break
             
             # Stop if we hit clearly non-author content
-            if any(stop in line.lower() for stop in ['abstract', 'keywords', 'introduction', 'email', '@', 'department', 'university', 'institute', 'college', 'school']):
+            if self._CAPTURE_STOP_RE.search(line):
                 break
             
             # Stop if it's metadata
@@ -618,12 +970,12 @@ class EnhancedPDFExtractor:
             # If line has author-like patterns, include it
             if self._looks_like_authors(line):
                 # But only if it actually has name patterns
-                if re.search(r'[A-Z][a-z]+[,\s]+[A-Z]', line):
+                if self._NAME_PAIR_RE.search(line):
                     authors_parts.append(line)
                 else:
                     break
             # If line looks like continuation (starts with lowercase or comma)
-            elif re.match(r'^[a-z,]', line) or line.startswith(','):
+            elif self._CONTINUATION_RE.match(line) or line.startswith(','):
                 authors_parts.append(line)
             else:
                 break
@@ -632,74 +984,53 @@ class EnhancedPDFExtractor:
         authors = ' '.join(authors_parts)
         
         # Clean up
-        authors = re.sub(r'\s+', ' ', authors)
-        authors = re.sub(r'\s*,\s*', ', ', authors)  # Normalize commas
+        authors = self._normalize_spacing(authors)  # Also normalizes commas
         
         # Final validation
         if self._is_invalid_author_string(authors):
             return ""
         
         # Remove common suffixes that might have been captured
-        authors = re.sub(r'\s+(Department|Institute|University|College|School).*$', '', authors, flags=re.IGNORECASE)
+        authors = self._CAPTURED_AFFILIATION_TAIL_RE.sub('', authors)
         
         return authors.strip()
 
     def _looks_like_authors(self, line: str) -> bool:
         """Check if a line looks like it contains authors."""
         # Skip lines that are clearly not authors
-        skip_words = ['copyright', 'volume', 'issue', 'journal', 'published', 'received', 'accepted', 'doi:', 'issn', 'http', 'www', '.com', '.org', '.edu']
-        if any(word in line.lower() for word in skip_words):
+        if self._AUTHOR_SKIP_RE.search(line):
             return False
         
         # Skip lines with dates (month + year patterns)
-        date_patterns = [
-            r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}\b',
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # Dates like 12/31/2020
-            r'\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b',  # Dates like 2020-12-31
-        ]
-        for pattern in date_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+        for pattern in self._DATE_RES:
+            if pattern.search(line):
                 return False
         
         # Skip lines that contain URLs or DOIs
-        if re.search(r'https?://|doi\.org|10\.\d{4,}/|www\.', line, re.IGNORECASE):
+        if self._URL_DOI_RE.search(line):
             return False
         
         # Skip lines that are mostly numbers or special characters
-        non_alpha_chars = sum(1 for c in line if not c.isalpha() and not c.isspace())
-        alpha_chars = sum(1 for c in line if c.isalpha())
+        alpha_chars, non_alpha_chars = self._count_alpha(line)
         if alpha_chars > 0 and non_alpha_chars / (alpha_chars + non_alpha_chars) > 0.5:
             return False
         
-        # Common author indicators
-        author_indicators = ['university', 'college', 'institute', 'department', 'lab', 'center', 'school', 'faculty']
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        
         # Check for email addresses
-        if re.search(email_pattern, line):
+        if self._EMAIL_RE.search(line):
             return True
         
         # Check for institutional affiliations
-        if any(indicator in line.lower() for indicator in author_indicators):
+        if self._AUTHOR_INDICATOR_RE.search(line):
             return True
         
         # Check for superscript numbers (common in author affiliations): Name¹, Name²
-        if re.search(r'[A-Z][a-z]+\s*[¹²³⁴⁵¹²³⁴⁵⁶⁷⁸⁹⁰\d]', line):
+        if self._SUPERSCRIPT_NAME_RE.search(line):
             return True
         
-        # Check for common author name patterns
-        name_patterns = [
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+',  # First Last
-            r'\b[A-Z][a-z]+,\s*[A-Z]',  # Last, First
-            r'\b[A-Z]\.\s*[A-Z]\.\s*[A-Z][a-z]+',  # A. B. Last
-            r'\b[A-Z][a-z]+\s+[A-Z]\.',  # First L.
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+',  # First Middle Last
-        ]
-        
-        # Count how many name-like patterns we find
+        # Count how many common author name patterns we find
         name_matches = 0
-        for pattern in name_patterns:
-            if re.search(pattern, line):
+        for pattern in self._NAME_RES:
+            if pattern.search(line):
                 name_matches += 1
         
         # If we have 2+ name patterns, it's likely an author line
@@ -710,7 +1041,7 @@ class EnhancedPDFExtractor:
         if ',' in line:
             parts = line.split(',')
             # Check if multiple parts look like names
-            name_like_parts = sum(1 for part in parts if re.search(r'[A-Z][a-z]+\s+[A-Z]', part.strip()))
+            name_like_parts = sum(1 for part in parts if self._NAME_PART_RE.search(part.strip()))
             if name_like_parts >= 2:
                 return True
         
@@ -719,26 +1050,15 @@ class EnhancedPDFExtractor:
     def _extract_abstract(self, text: str) -> str:
         """Extract abstract from text."""
         # Look for abstract section in first 3000 characters
-        first_part = text[:3000]
-        
-        # Try multiple abstract patterns
-        abstract_patterns = [
-            r'Abstract[:\s\-–]*\n(.*?)(?=\n\s*(?:Keywords?|Key\s+Words?|Introduction|1\.|I\.|Background|Methods|References?|©|\d+\.\s+Introduction))',
-            r'ABSTRACT[:\s\-–]*\n(.*?)(?=\n\s*(?:KEYWORDS?|KEY\s+WORDS?|INTRODUCTION|1\.|I\.|BACKGROUND|METHODS|REFERENCES?|©|\d+\.\s+INTRODUCTION))',
-            r'(?:Abstract|ABSTRACT)[:\s\-–]+(.*?)(?=\n\n|Keywords?|Introduction)',
-        ]
-        
-        for pattern in abstract_patterns:
-            match = re.search(pattern, first_part, re.DOTALL | re.IGNORECASE)
+        for pattern in self._ABSTRACT_RES:
+            match = pattern.search(text, 0, 3000)
             if match:
                 abstract = match.group(1).strip()
                 # Clean up the abstract
-                abstract = re.sub(r'\s+', ' ', abstract)
-                abstract = re.sub(r'\n+', ' ', abstract)
+                abstract = self._WHITESPACE_RE.sub(' ', abstract)
                 
                 # Remove page numbers and other artifacts
-                abstract = re.sub(r'Page\s+\d+', '', abstract)
-                abstract = re.sub(r'\d+\s*$', '', abstract)
+                abstract = self._ABSTRACT_CLEANUP_RE.sub('', abstract)
                 
                 # Check if it's a reasonable abstract length (50-5000 chars)
                 if 50 <= len(abstract) <= 5000:
@@ -754,99 +1074,94 @@ class EnhancedPDFExtractor:
         return ""
     
     def _extract_issn(self, text: str) -> str:
-        """Extract ISSN from text."""
-        # Look in first 2000 characters
-        search_text = text[:2000]
-        
-        # Try ISSN pattern with label first
-        issn_label_pattern = re.compile(
-            r'ISSN[:\s]+(\d{4})-(\d{3}[\dXx])',
-            re.IGNORECASE
-        )
-        
-        match = issn_label_pattern.search(search_text)
-        if match:
-            if isinstance(match.groups(), tuple) and len(match.groups()) >= 2:
-                return f"{match.group(1)}-{match.group(2)}"
-        
-        # Try generic ISSN pattern
-        match = self.issn_pattern.search(search_text)
-        if match:
-            if isinstance(match.groups(), tuple) and len(match.groups()) >= 2:
-                return f"{match.group(1)}-{match.group(2)}"
-        
-        return ""
+        """Extract ISSN (NNNN-NNNX) from text."""
+        # Look in first 2000 characters. Every ISSN has a fixed 9-character
+        # shape around a hyphen, so check the characters next to each hyphen
+        # instead of running a regex. A labelled ISSN ("ISSN: ...") wins
+        # over the first bare one; bare ones need word boundaries on both sides.
+        end = min(len(text), 2000)
+        unlabelled = ""
+        hyphen = text.find('-', 4, end - 4)
+        while hyphen >= 0:
+            candidate = text[hyphen - 4:hyphen + 5]
+            if (candidate[:4].isdecimal() and candidate[5:8].isdecimal()
+                    and (candidate[8].isdecimal() or candidate[8] in 'Xx')):
+                if self._has_issn_label(text, hyphen - 4):
+                    return candidate
+                if (not unlabelled
+                        and (hyphen < 5 or not self._is_word_char(text[hyphen - 5]))
+                        and (hyphen + 5 >= end or not self._is_word_char(text[hyphen + 5]))):
+                    unlabelled = candidate
+            hyphen = text.find('-', hyphen + 1, end - 4)
+        
+        return unlabelled
+
+    @classmethod
+    def _has_issn_label(cls, text: str, start: int) -> bool:
+        """Whether text[:start] ends with "ISSN" plus at least one ':'/whitespace."""
+        label_end = start
+        while label_end > 0 and (text[label_end - 1] == ':' or text[label_end - 1].isspace()):
+            label_end -= 1
+        return (label_end < start and label_end >= 4
+                and cls._ISSN_WORD_RE.fullmatch(text, label_end - 4, label_end) is not None)
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        """Whether char is a regex \\w character (Unicode letters and digits, '_')."""
+        return char.isalnum() or char == '_'
 
     def _extract_year(self, text: str) -> int:
         """Extract publication year from text."""
-        years = []
+        # Every candidate starts with "19" or "20"; skip both scans when the
+        # window has neither
+        if text.find('19', 0, 2000) < 0 and text.find('20', 0, 2000) < 0:
+            return 0
         
-        # Look for 4-digit years in first 500 characters (where metadata usually is)
-        first_part = text[:500]
-        year_pattern = re.compile(r'\b(19|20)\d{2}\b')
-        matches = year_pattern.findall(first_part)
-        
-        for match in matches:
-            if isinstance(match, str):
-                year = int(match)
-            else:
-                year = int(''.join(match))
-            
-            # Only accept reasonable years (1950-2030)
-            if 1950 <= year <= 2030:
-                years.append(year)
+        # One character per byte ("?" for non-ASCII), so offsets still line up
+        prefix = text[:2000].encode('ascii', 'replace')
         
+        # Look for 4-digit years in first 500 characters (where metadata usually is),
+        # only accepting reasonable years (1950-2030)
+        years = [year for year in map(int, self.year_pattern.findall(prefix, 0, 500)) if 1950 <= year <= 2030]
         if years:
             # Return the most recent year (likely publication year)
             return max(years)
         
-        # Try full text if not found in first part
-        all_matches = year_pattern.findall(text[:2000])
-        for match in all_matches:
-            if isinstance(match, str):
-                year = int(match)
-            else:
-                year = int(''.join(match))
-            
-            if 1950 <= year <= 2030:
-                years.append(year)
-        
-        return max(years) if years else 0
+        # Otherwise continue up to 2000 characters. The first part had no
+        # acceptable year, so resume where a year could still straddle the
+        # 500 boundary (\b looks behind pos, so no partial numbers match).
+        years = [year for year in map(int, self.year_pattern.findall(prefix, 500 - 3)) if 1950 <= year <= 2030]
+        return max(years, default=0)
 
     def _extract_month(self, text: str) -> str:
         """Extract publication month from text."""
         # Look for month patterns in first 1000 characters (where metadata usually is)
-        first_part = text[:1000]
+        match = _search_by_priority(
+            self.month_pattern, text, self.month_kinds,
+            accept=lambda value: value.lower() in self.month_mapping,
+            endpos=1000
+        )
+        if match:
+            return self.month_mapping[match.lower()]
         
-        for pattern in self.month_patterns:
-            matches = pattern.findall(first_part)
-            for match in matches:
-                if isinstance(match, tuple):
-                    match = match[0]  # Get first group if tuple
-                
-                match_lower = match.lower().strip()
-                if match_lower in self.month_mapping:
-                    return self.month_mapping[match_lower]
+        # Every remaining pattern needs a 19xx/20xx year: skip them all when
+        # the window has neither digit pair (a plain substring scan)
+        if text.find('19', 0, 2000) < 0 and text.find('20', 0, 2000) < 0:
+            return ""
         
         # Try to find month near year
-        year_month_pattern = re.compile(r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\.?\s*[,\.]?\s*(19|20)\d{2}\b', re.IGNORECASE)
-        matches = year_month_pattern.findall(text[:2000])
-        
-        for match in matches:
-            month_part = match[0].lower().strip()
+        for match in self._YEAR_MONTH_RE.finditer(text, 0, 2000):
+            month_part = match.group(1).lower().strip()
             if month_part in self.month_mapping:
                 return self.month_mapping[month_part]
         
-        # Try to find month in date patterns (MM/DD/YYYY, DD/MM/YYYY, etc.)
-        date_patterns = [
-            re.compile(r'\b(0?[1-9]|1[0-2])/(0?[1-9]|[12][0-9]|3[01])/(19|20)\d{2}\b'),  # MM/DD/YYYY
-            re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])/(0?[1-9]|1[0-2])/(19|20)\d{2}\b'),  # DD/MM/YYYY
-            re.compile(r'\b(19|20)\d{2}-(0?[1-9]|1[0-2])-(0?[1-9]|[12][0-9]|3[01])\b'),  # YYYY-MM-DD
-        ]
-        
-        for pattern in date_patterns:
-            matches = pattern.findall(text[:2000])
-            for match in matches:
+        # Try to find month in date patterns (MM/DD/YYYY, DD/MM/YYYY, etc.),
+        # skipping a pattern outright when its separator is absent
+        for separator, pattern in self._NUMERIC_DATE_RES:
+            if text.find(separator, 0, 2000) < 0:
+                continue
+            for date_match in pattern.finditer(text, 0, 2000):
+                match = date_match.groups()
                 if len(match) >= 2:
                     month_num = match[1] if match[0].startswith('19') or match[0].startswith('20') else match[0]
                     if month_num in self.month_mapping:
@@ -857,27 +1172,20 @@ class EnhancedPDFExtractor:
     def _extract_journal(self, text: str) -> str:
         """Extract journal name from text."""
         # Look in first 1000 characters where journal name usually appears
-        first_part = text[:1000]
-        
         # Try pattern matching first
-        for pattern in self.journal_patterns:
-            match = pattern.search(first_part)
-            if match:
-                journal_name = match.group(0).strip()
-                # Clean up the journal name
-                journal_name = re.sub(r'^(Journal|Proceedings|Conference)\s+', '', journal_name, flags=re.IGNORECASE)
-                return journal_name
-        
-        # Look for common journal indicators
-        journal_indicators = [
-            r'(?:Published\s+in|In)\s+([A-Z][^,\n]{10,80})',
-            r'(?:Conference|Workshop|Symposium)\s+(?:on|of)\s+([A-Z][^,\n]{10,60})',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\s+Journal)',
-        ]
-        
-        for pattern_str in journal_indicators:
-            pattern = re.compile(pattern_str)
-            match = pattern.search(first_part)
+        journal_name = _search_by_priority(self.journal_pattern, text, self.journal_kinds, endpos=1000)
+        if journal_name:
+            journal_name = journal_name.strip()
+            # Clean up the journal name
+            journal_name = self._JOURNAL_PREFIX_RE.sub('', journal_name)
+            return journal_name
+        
+        # Look for common journal indicators, skipping patterns whose
+        # required word is missing
+        for literals, pattern in self._JOURNAL_INDICATOR_RES:
+            if literals and all(text.find(literal, 0, 1000) < 0 for literal in literals):
+                continue
+            match = pattern.search(text, 0, 1000)
             if match:
                 return match.group(1).strip()
         
@@ -887,38 +1195,40 @@ class EnhancedPDFExtractor:
         """Extract keywords from text."""
         keywords = []
         
-        for pattern in self.keywords_patterns:
-            match = pattern.search(text)
-            if match:
-                keyword_text = match.group(1).strip()
-                # Split by common separators
-                keyword_list = re.split(r'[,;]', keyword_text)
-                keywords.extend([kw.strip() for kw in keyword_list if kw.strip()])
-                break
+        keyword_text = _search_by_priority(self.keywords_pattern, text, self.keywords_kinds)
+        if keyword_text:
+            keyword_text = keyword_text.strip()
+            # Split by common separators
+            keyword_list = self._KEYWORD_SEPARATOR_RE.split(keyword_text)
+            keywords.extend([kw.strip() for kw in keyword_list if kw.strip()])
         
         return keywords
 
-    def _extract_full_text(self, doc: fitz.Document) -> str:
-        """Extract full text from entire document."""
-        full_text = ""
+    def _extract_page_texts(self, doc: fitz.Document, max_pages: Optional[int] = None) -> List[str]:
+        """Decode the text of every page (or the first max_pages) exactly once."""
+        page_texts = []
+        page_count = len(doc) if max_pages is None else min(max_pages, len(doc))
         
-        for page_num in range(len(doc)):
+        for page_num in range(page_count):
             try:
-                page = doc[page_num]
-                page_text = page.get_text()
-                if page_text:
-                    full_text += f"Page {page_num + 1}:\n{page_text}\n\n"
+                page_texts.append(doc[page_num].get_text("text", flags=self.text_flags, sort=False))
             except Exception as e:
                 logger.warning(f"Error extracting text from page {page_num + 1}: {e}")
-                continue
+                page_texts.append("")
         
-        return full_text.strip()
+        return page_texts
+
+    def _extract_full_text(self, page_texts: List[str]) -> str:
+        """Assemble full document text from already decoded pages."""
+        return "".join(
+            f"Page {page_num}:\n{page_text}\n\n"
+            for page_num, page_text in enumerate(page_texts, 1)
+            if page_text
+        ).strip()
 
     def _find_and_enrich_from_crossref(self, metadata: ExtractedMetadata) -> None:
         """Find DOI via Crossref search and enrich metadata."""
         try:
-            from .crossref_fetcher import crossref_fetcher
-            
             # Search for DOI using title and authors
             logger.info(f"Searching for DOI with title: {metadata.title[:50]}...")
             found_doi = crossref_fetcher.find_doi_by_metadata(metadata.title, metadata.authors)
@@ -935,37 +1245,21 @@ class EnhancedPDFExtractor:
         except Exception as e:
             logger.error(f"Error finding DOI from Crossref: {e}")
     
-    def _enrich_from_crossref(self, metadata: ExtractedMetadata) -> None:
-        """Enrich metadata using Crossref API."""
+    def _enrich_from_crossref(self, metadata: ExtractedMetadata, crossref_data=None) -> None:
+        """Enrich metadata using Crossref API (or an already fetched Crossref record)."""
         try:
-            crossref_data = fetch_metadata_by_doi(metadata.doi)
+            if crossref_data is None:
+                crossref_data = fetch_metadata_by_doi(metadata.doi)
             
             if crossref_data.success:
-                logger.info("Successfully fetched metadata from Crossref")
-                
                 # Update with Crossref data (only if better than extracted)
-                if crossref_data.title and len(crossref_data.title) > len(metadata.title):
-                    metadata.title = crossref_data.title
-                    logger.info(f"Updated title from Crossref: {metadata.title[:50]}...")
-                
-                if crossref_data.authors and len(crossref_data.authors) > len(metadata.authors):
-                    metadata.authors = crossref_data.authors
-                    logger.info(f"Updated authors from Crossref")
-                
-                if crossref_data.journal:
-                    metadata.journal = crossref_data.journal
-                    logger.info(f"Updated journal from Crossref: {metadata.journal}")
-                
-                if crossref_data.publisher:
-                    metadata.publisher = crossref_data.publisher
-                
-                if crossref_data.year > 0:
-                    metadata.year = crossref_data.year
-                    logger.info(f"Updated year from Crossref: {metadata.year}")
-                
-                if crossref_data.abstract and len(crossref_data.abstract) > len(metadata.abstract):
-                    metadata.abstract = crossref_data.abstract
-                    logger.info("Updated abstract from Crossref")
+                updated = []
+                for field_name, only_if_longer in self._CROSSREF_MERGE_RULES:
+                    value = getattr(crossref_data, field_name)
+                    if value and (not only_if_longer or len(value) > len(getattr(metadata, field_name))):
+                        setattr(metadata, field_name, value)
+                        updated.append(field_name)
+                logger.debug('Fetched metadata from Crossref; updated: %s', ', '.join(updated) or 'nothing')
                 
                 # Boost confidence since we have Crossref validation
                 metadata.confidence = 0.95
@@ -978,8 +1272,6 @@ class EnhancedPDFExtractor:
     def _validate_with_issn(self, metadata: ExtractedMetadata) -> None:
         """Validate and enrich metadata using ISSN."""
         try:
-            from .issn_validator import issn_validator
-            
             logger.info(f"Validating journal with ISSN: {metadata.issn}")
             issn_data = issn_validator.validate_by_issn(metadata.issn)
             
@@ -1007,8 +1299,6 @@ class EnhancedPDFExtractor:
     def _detect_paper_type(self, text: str, metadata: ExtractedMetadata) -> str:
         """Detect paper type from PDF content."""
         try:
-            from .paper_type_detector import paper_type_detector
-            
             paper_type = paper_type_detector.detect_paper_type(
                 text=text,
                 title=metadata.title,
@@ -1025,8 +1315,6 @@ class EnhancedPDFExtractor:
     def _determine_indexing_status(self, metadata: ExtractedMetadata) -> str:
         """Determine indexing status (SCI, Scopus, etc.)."""
         try:
-            from .indexing_validator import indexing_validator
-            
             # Prepare metadata dictionary
             metadata_dict = {
                 'journal': metadata.journal,
@@ -1062,9 +1350,6 @@ class EnhancedPDFExtractor:
                 return domain
             
             # Fallback to existing classifier
-            from .research_domain_classifier import research_domain_classifier
-            
-            # Classify domain
             classification = research_domain_classifier.classify_domain(
                 text=text,
                 title=metadata.title,
@@ -1079,37 +1364,29 @@ class EnhancedPDFExtractor:
             logger.error(f"Error classifying research domain: {e}")
             return ""
     
+    def _calculate_local_confidence(self, metadata: ExtractedMetadata) -> float:
+        """Fraction of the text-derived fields (those Crossref/ISSN could fill) already present."""
+        fields = (
+            metadata.title, metadata.authors, metadata.abstract, metadata.year > 0,
+            metadata.doi, metadata.issn, metadata.journal,
+        )
+        return sum(map(bool, fields)) / len(fields)
+    
     def _calculate_confidence(self, metadata: ExtractedMetadata) -> float:
         """Calculate confidence score for extracted metadata."""
-        score = 0.0
-        total_fields = 10  # title, authors, abstract, year, doi, issn, journal, paper_type, indexing_status, research_domain
-        
-        if metadata.title:
-            score += 1.0
-        if metadata.authors:
-            score += 1.0
-        if metadata.abstract:
-            score += 1.0
-        if metadata.year > 0:
-            score += 1.0
-        if metadata.doi:
-            score += 1.0
-        if metadata.issn:
-            score += 1.0
-        if metadata.journal:
-            score += 1.0
-        if metadata.paper_type and metadata.paper_type != "Unknown":
-            score += 1.0
-        if metadata.indexing_status and metadata.indexing_status != "Non-SCI/Non-Scopus":
-            score += 1.0
-        if metadata.research_domain:
-            score += 1.0
-        
-        return score / total_fields
+        fields = (
+            metadata.title, metadata.authors, metadata.abstract, metadata.year > 0,
+            metadata.doi, metadata.issn, metadata.journal,
+            metadata.paper_type and metadata.paper_type != "Unknown",
+            metadata.indexing_status and metadata.indexing_status != "Non-SCI/Non-Scopus",
+            metadata.research_domain,
+        )
+        return sum(map(bool, fields)) / len(fields)
 
-    def get_extraction_stats(self, file_path: str) -> Dict:
-        """Get detailed extraction statistics."""
-        metadata = self.extract_metadata(file_path)
+    def get_extraction_stats(self, file_path: str, metadata: Optional[ExtractedMetadata] = None) -> Dict:
+        """Get detailed extraction statistics (from metadata when already extracted)."""
+        if metadata is None:
+            metadata = self.extract_metadata(file_path)
         
         return {
             "success": metadata.confidence > 0,
@@ -1137,12 +1414,15 @@ class EnhancedPDFExtractor:
 enhanced_pdf_extractor = EnhancedPDFExtractor() if HAS_PYMUPDF else None
 
 
-def extract_paper_metadata(file_path: str) -> ExtractedMetadata:
+def extract_paper_metadata(file_path: str, need_full_text: bool = True,
+                           use_crossref_search: Optional[bool] = None) -> ExtractedMetadata:
     """
     Convenience function to extract metadata from a research paper PDF.
     
     Args:
         file_path: Path to PDF file
+        need_full_text: Whether to extract the full document text
+        use_crossref_search: Search Crossref by title/authors when no DOI is found
         
     Returns:
         ExtractedMetadata object
@@ -1151,15 +1431,17 @@ def extract_paper_metadata(file_path: str) -> ExtractedMetadata:
         logger.error("PyMuPDF is required for enhanced PDF extraction")
         return ExtractedMetadata()
     
-    return enhanced_pdf_extractor.extract_metadata(file_path)
+    return enhanced_pdf_extractor.extract_metadata(file_path, need_full_text, use_crossref_search)
 
 
-def get_extraction_stats(file_path: str) -> Dict:
+def get_extraction_stats(file_path: str, metadata: Optional[ExtractedMetadata] = None) -> Dict:
     """
     Get extraction statistics for a PDF file.
     
     Args:
         file_path: Path to PDF file
+        metadata: Result of an earlier extract_paper_metadata call for this
+            file; when given the PDF is not opened or extracted again
         
     Returns:
         Dictionary with extraction statistics
@@ -1167,4 +1449,30 @@ def get_extraction_stats(file_path: str) -> Dict:
     if not HAS_PYMUPDF:
         return {"success": False, "error": "PyMuPDF not available"}
     
-    return enhanced_pdf_extractor.get_extraction_stats(file_path)
+    return enhanced_pdf_extractor.get_extraction_stats(file_path, metadata)
+
+
+def _extract_local_or_none(file_path: str, need_full_text: bool = True):
+    """Process-pool entry point; each worker process uses its own global extractor."""
+    return enhanced_pdf_extractor._extract_local_or_none(file_path, need_full_text)
+
+
+def extract_papers_metadata(file_paths: List[str], workers: int = 1, need_full_text: bool = True,
+                            use_crossref_search: Optional[bool] = None) -> List[ExtractedMetadata]:
+    """
+    Convenience function to extract metadata from several research paper PDFs.
+    
+    Args:
+        file_paths: Paths to PDF files
+        workers: Number of processes for local text extraction
+        need_full_text: Whether to extract the full document text
+        use_crossref_search: Search Crossref by title/authors when no DOI is found
+        
+    Returns:
+        ExtractedMetadata objects in the same order as file_paths
+    """
+    if not HAS_PYMUPDF:
+        logger.error("PyMuPDF is required for enhanced PDF extraction")
+        return [ExtractedMetadata() for _ in file_paths]
+    
+    return enhanced_pdf_extractor.extract_metadata_batch(file_paths, workers, need_full_text, use_crossref_search)
@@ -3,18 +3,29 @@ Google Scholar Validator
 Validates papers and fetches metadata using Google Scholar when DOI/ISSN fails.
 """
 
+import json
 import logging
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
-from typing import Optional, Dict, List
+from html import unescape
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
+import threading
 import time
 from urllib.parse import quote_plus
 
+from .api_cache import APICache
+from ..config import SCHOLAR_BLOCK_STATE_PATH
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScholarMetadata:
     """Container for Google Scholar metadata."""
     title: str = ""
@@ -33,6 +44,30 @@ class ScholarMetadata:
 class GoogleScholarValidator:
     """Validate papers using Google Scholar."""
     
+    # Result-page parsing (compiled once, used on every search)
+    _RESULT_RE = re.compile(r'<div class="gs_ri">(.*?)</div>\s*</div>', re.DOTALL)
+    _TITLE_RE = re.compile(r'<h3[^>]*><a[^>]*>(.*?)</a>')
+    _INFO_RE = re.compile(r'<div class="gs_a">(.*?)</div>')
+    _SNIPPET_RE = re.compile(r'<div class="gs_rs">(.*?)</div>')
+    _CITATION_RE = re.compile(r'Cited by (\d+)')
+    _YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+    _TAG_RE = re.compile(r'<[^>]+>')
+    
+    # Common words ignored when comparing titles
+    _STOP_WORDS = frozenset({'a', 'an', 'the', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'and', 'or'})
+    
+    # Lowercase markers of a captcha/block page, and of an error page served
+    # in place of a results page
+    _CAPTCHA_INDICATORS = (
+        'captcha',
+        'sorry, but your computer or network',
+        'our systems have detected unusual traffic',
+        'unusual traffic from your computer network',
+        'please show you\'re not a robot',
+        'ip address may be compromised',
+    )
+    _ERROR_PAGE_INDICATORS = ('error', 'blocked', 'forbidden', 'access denied')
+    
     def __init__(self):
         """Initialize Google Scholar validator."""
         self.session = requests.Session()
@@ -40,36 +75,93 @@ class GoogleScholarValidator:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.base_url = "https://scholar.google.com/scholar"
+        # Token bucket: sustained rate of one request per rate_limit_delay
+        # seconds, with short bursts of up to burst_capacity requests
         self.rate_limit_delay = 5.0  # Increased delay to be more respectful to Google
-        self.last_request_time = 0
+        self.burst_capacity = 3
+        self._tokens = float(self.burst_capacity)
+        self._last_refill = time.monotonic()
+        self._rate_limit_lock = threading.Lock()
         self.max_retries = 3
-        self.retry_delays = [10.0, 30.0, 60.0]  # Exponential backoff delays in seconds
+        
+        # Retries happen inside urllib3: connection errors, timeouts and 503s
+        # back off exponentially (0s, 20s, 40s), and a 429/503 carrying
+        # Retry-After waits exactly as long as Google asks. A 429 without it
+        # is usually the captcha page, which must not be retried.
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=10.0,
+            backoff_max=60.0,
+            status_forcelist=[503],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # All traffic goes to one host, so one small pool of kept-alive connections
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
         self.is_blocked = False  # Track if Google Scholar is currently blocked
-        self.blocked_until = 0  # Timestamp when block expires (0 = not blocked)
+        self.blocked_until = 0  # Wall-clock timestamp when block expires (0 = not blocked)
+        self.block_state_path = SCHOLAR_BLOCK_STATE_PATH
+        self._load_block_state()
+        self._cache = APICache("scholar")
+    
+    def _load_block_state(self):
+        """Pick up a block recorded by an earlier run or another process."""
+        try:
+            with open(self.block_state_path, 'r', encoding='utf-8') as f:
+                blocked_until = float(json.load(f).get('blocked_until', 0))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.debug(f"Ignoring unreadable Google Scholar block state: {e}")
+            return
+        
+        if blocked_until > time.time():
+            self.is_blocked = True
+            self.blocked_until = blocked_until
+    
+    def _save_block_state(self):
+        """Record the block expiry so restarts and other processes honour it."""
+        try:
+            self.block_state_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temp file and rename it, so readers never see a partial file
+            tmp_path = self.block_state_path.with_name(f"{self.block_state_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'blocked_until': self.blocked_until}, f)
+            os.replace(tmp_path, self.block_state_path)
+        except OSError as e:
+            logger.warning(f"Could not save Google Scholar block state: {e}")
     
     def is_currently_blocked(self) -> bool:
         """
-        Check if Google Scholar is currently blocked.
+        Check if Google Scholar is currently blocked (here or in another process).
         
         Returns:
             True if blocked, False otherwise
         """
         if not self.is_blocked:
-            return False
+            self._load_block_state()
+            if not self.is_blocked:
+                return False
         
         # Check if block has expired (after 1 hour)
-        if self.blocked_until > 0 and time.time() > self.blocked_until:
+        if self.blocked_until > 0 and self.block_remaining() == 0:
             logger.info("Google Scholar block expired, resetting status")
             self.is_blocked = False
             self.blocked_until = 0
+            self._save_block_state()
             return False
         
         return self.is_blocked
     
+    def block_remaining(self) -> float:
+        """Seconds until the current block expires (0 when not blocked or already expired)."""
+        return max(0.0, self.blocked_until - time.time())
+    
     def search_paper(self, title: str, authors: str = "", year: int = 0) -> ScholarMetadata:
         """
-        Search for a paper in Google Scholar with retry logic for rate limits.
-        Fails fast if blocked/captcha detected.
+        Search for a paper in Google Scholar (the session retries transient
+        failures). Fails fast if blocked/captcha detected.
         
         Args:
             title: Paper title
@@ -79,98 +171,81 @@ class GoogleScholarValidator:
         Returns:
             ScholarMetadata object
         """
-        # Check if we're already blocked
-        if self.is_currently_blocked():
-            logger.warning("Google Scholar is currently blocked, skipping search")
-            return ScholarMetadata(error="Google Scholar is currently blocked")
-        
-        if not title or len(title) < 5:
-            return ScholarMetadata(error="Title too short")
+        # Reject hopeless queries before any rate-limit wait
+        error = self._validate_query(title)
+        if error:
+            return ScholarMetadata(error=error)
         
         # Build search query
+        first_author = authors.split(',')[0] if authors else ""
         query = title
-        if authors:
-            query += f" {authors.split(',')[0]}"  # Add first author
+        if first_author:
+            query += f" {first_author}"  # Add first author
         
-        # Try with retries for rate limiting
-        for attempt in range(self.max_retries + 1):
-            try:
-                self._respect_rate_limit()
-                
-                logger.info(f"Searching Google Scholar for: {query[:50]}... (attempt {attempt + 1}/{self.max_retries + 1})")
-                
-                # Search Google Scholar
-                params = {
-                    'q': query,
-                    'hl': 'en',
-                    'as_sdt': '0,5'  # Include patents and citations
-                }
-                
-                response = self.session.get(
-                    self.base_url,
-                    params=params,
-                    timeout=15  # Increased timeout
-                )
-                
-                # Check for captcha or blocking - FAIL FAST (no retries)
-                if self._is_blocked_or_captcha(response.text):
-                    logger.error("Google Scholar blocked/captcha detected - marking as blocked and failing fast")
-                    # Mark as blocked for 1 hour
-                    self.is_blocked = True
-                    self.blocked_until = time.time() + 3600  # Block for 1 hour
-                    return ScholarMetadata(error="Blocked by Google Scholar (captcha or IP block)")
-                
-                if response.status_code == 200:
-                    # Success - reset block status if it was set
-                    if self.is_blocked:
-                        logger.info("Google Scholar access restored")
-                        self.is_blocked = False
-                        self.blocked_until = 0
-                    return self._parse_results(response.text, title, year)
-                elif response.status_code == 429:
-                    if attempt < self.max_retries:
-                        wait_time = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
-                        logger.warning(f"Google Scholar rate limit hit. Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error("Google Scholar rate limit exceeded after all retries")
-                        return ScholarMetadata(error="Rate limit exceeded")
-                elif response.status_code == 503:
-                    # Service unavailable - retry with delay
-                    if attempt < self.max_retries:
-                        wait_time = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
-                        logger.warning(f"Google Scholar service unavailable. Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error("Google Scholar service unavailable after all retries")
-                        return ScholarMetadata(error="Service unavailable")
-                else:
-                    logger.error(f"Google Scholar error: {response.status_code}")
-                    return ScholarMetadata(error=f"HTTP {response.status_code}")
-                    
-            except requests.Timeout:
-                if attempt < self.max_retries:
-                    wait_time = self.retry_delays[min(attempt, len(self.retry_delays) - 1)] / 2
-                    logger.warning(f"Google Scholar timeout. Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error("Google Scholar timeout after all retries")
-                    return ScholarMetadata(error="Timeout")
-            except Exception as e:
-                if attempt < self.max_retries:
-                    wait_time = self.retry_delays[min(attempt, len(self.retry_delays) - 1)] / 2
-                    logger.warning(f"Google Scholar error: {e}. Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"Google Scholar error after all retries: {e}")
-                    return ScholarMetadata(error=str(e))
+        cache_key = f"{' '.join(title.lower().split())}\0{' '.join(first_author.lower().split())}\0{year}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Should not reach here, but just in case
-        return ScholarMetadata(error="Failed after all retries")
+        # Check if we're already blocked
+        if self.is_currently_blocked():
+            logger.warning(f"Google Scholar is currently blocked for another {self.block_remaining():.0f}s, skipping search")
+            return ScholarMetadata(error="Google Scholar is currently blocked")
+        
+        try:
+            self._respect_rate_limit()
+            
+            logger.info(f"Searching Google Scholar for: {query[:50]}...")
+            
+            # Search Google Scholar (retries are handled by the session's adapter)
+            params = {
+                'q': query,
+                'hl': 'en',
+                'as_sdt': '0,5'  # Include patents and citations
+            }
+            
+            response = self.session.get(
+                self.base_url,
+                params=params,
+                timeout=15  # Increased timeout
+            )
+            
+            # Check for captcha or blocking - FAIL FAST (no retries)
+            if self._is_blocked_or_captcha(response.text):
+                logger.error("Google Scholar blocked/captcha detected - marking as blocked and failing fast")
+                # Mark as blocked for 1 hour
+                self.is_blocked = True
+                self.blocked_until = time.time() + 3600  # Block for 1 hour
+                self._save_block_state()
+                return ScholarMetadata(error="Blocked by Google Scholar (captcha or IP block)")
+            
+            if response.status_code == 200:
+                # Success - reset block status if it was set
+                if self.is_blocked:
+                    logger.info("Google Scholar access restored")
+                    self.is_blocked = False
+                    self.blocked_until = 0
+                    self._save_block_state()
+                metadata = self._parse_results(response.text, title, year)
+                if metadata.success:
+                    self._cache.set(cache_key, metadata)
+                return metadata
+            elif response.status_code == 429:
+                logger.error("Google Scholar rate limit exceeded")
+                return ScholarMetadata(error="Rate limit exceeded")
+            elif response.status_code == 503:
+                logger.error("Google Scholar service unavailable after all retries")
+                return ScholarMetadata(error="Service unavailable")
+            else:
+                logger.error(f"Google Scholar error: {response.status_code}")
+                return ScholarMetadata(error=f"HTTP {response.status_code}")
+                
+        except requests.Timeout:
+            logger.error("Google Scholar timeout")
+            return ScholarMetadata(error="Timeout")
+        except Exception as e:
+            logger.error(f"Google Scholar error after all retries: {e}")
+            return ScholarMetadata(error=str(e))
     
     def validate_by_title(self, title: str, authors: str = "") -> bool:
         """
@@ -186,17 +261,63 @@ class GoogleScholarValidator:
         result = self.search_paper(title, authors)
         return result.success
     
+    def search_papers(self, queries: List[Tuple[str, str, int]], max_workers: int = 2) -> List[ScholarMetadata]:
+        """
+        Search several papers, overlapping each response's parsing with the
+        next request's rate-limit wait.
+        
+        Requests still go out at the shared limiter's pace (a burst of up to
+        burst_capacity, then one per rate_limit_delay seconds).
+        
+        Args:
+            queries: (title, authors, year) tuples
+            max_workers: Number of threads issuing searches
+            
+        Returns:
+            ScholarMetadata objects in the same order as queries
+        """
+        if max_workers <= 1 or len(queries) <= 1:
+            return [self.search_paper(*query) for query in queries]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda query: self.search_paper(*query), queries))
+    
+    def _validate_query(self, title: str) -> Optional[str]:
+        """
+        Check a title before searching.
+        
+        Args:
+            title: Paper title
+            
+        Returns:
+            Error message, or None if the title is worth searching for
+        """
+        if not title or len(title) < 5:
+            return "Title too short"
+        
+        # Every result title would score 0 against it in _calculate_match_score
+        if not self._title_words(title):
+            return "Title has no searchable words"
+        
+        return None
+    
     def _respect_rate_limit(self):
-        """Respect rate limits to avoid blocking."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """Respect rate limits to avoid blocking (safe to call from several threads)."""
+        # Take a token under the lock, then wait outside it. A negative
+        # balance counts the requests already queued for future refills.
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst_capacity),
+                self._tokens + (now - self._last_refill) / self.rate_limit_delay
+            )
+            self._last_refill = now
+            self._tokens -= 1.0
+            sleep_time = max(0.0, -self._tokens * self.rate_limit_delay)
         
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
+        if sleep_time:
             logger.debug(f"Rate limiting: sleeping {sleep_time:.1f}s")
             time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
     
     def _is_blocked_or_captcha(self, html: str) -> bool:
         """
@@ -213,24 +334,16 @@ class GoogleScholarValidator:
         
         html_lower = html.lower()
         
-        # Check for common captcha/block indicators
-        captcha_indicators = [
-            'captcha',
-            'sorry, but your computer or network',
-            'our systems have detected unusual traffic',
-            'unusual traffic from your computer network',
-            'please show you\'re not a robot',
-            'ip address may be compromised'
-        ]
-        
-        for indicator in captcha_indicators:
-            if indicator in html_lower:
-                return True
+        # Check for common captcha/block indicators. Separate substring scans
+        # beat a single regex alternation here: each `in` is a fast C search,
+        # while the regex engine retries every alternative at each offset.
+        if any(indicator in html_lower for indicator in self._CAPTCHA_INDICATORS):
+            return True
         
         # Check if it's not a search results page (might be blocked)
         if 'gs_ri' not in html and 'scholar.google.com' in html:
             # Check if it looks like an error or blocking page
-            if any(indicator in html_lower for indicator in ['error', 'blocked', 'forbidden', 'access denied']):
+            if any(indicator in html_lower for indicator in self._ERROR_PAGE_INDICATORS):
                 return True
         
         return False
@@ -242,29 +355,26 @@ class GoogleScholarValidator:
             # Google Scholar HTML structure (simplified parsing)
             
             # Find first result div
-            result_pattern = r'<div class="gs_ri">(.*?)</div>\s*</div>'
-            matches = re.findall(result_pattern, html, re.DOTALL)
+            first_match = self._RESULT_RE.search(html)
             
-            if not matches:
+            if not first_match:
                 return ScholarMetadata(error="No results found")
             
-            first_result = matches[0]
+            first_result = first_match.group(1)
             
             metadata = ScholarMetadata()
             metadata.success = True
             
             # Extract title
-            title_pattern = r'<h3[^>]*><a[^>]*>(.*?)</a>'
-            title_match = re.search(title_pattern, first_result)
+            title_match = self._TITLE_RE.search(first_result)
             if title_match:
-                title = re.sub(r'<[^>]+>', '', title_match.group(1))
+                title = self._TAG_RE.sub('', title_match.group(1))
                 metadata.title = self._clean_text(title)
             
             # Extract authors and publication info
-            info_pattern = r'<div class="gs_a">(.*?)</div>'
-            info_match = re.search(info_pattern, first_result)
+            info_match = self._INFO_RE.search(first_result)
             if info_match:
-                info_text = re.sub(r'<[^>]+>', '', info_match.group(1))
+                info_text = self._TAG_RE.sub('', info_match.group(1))
                 parts = info_text.split(' - ')
                 
                 if len(parts) >= 1:
@@ -273,7 +383,7 @@ class GoogleScholarValidator:
                 if len(parts) >= 2:
                     pub_info = parts[1]
                     # Try to extract year
-                    year_match = re.search(r'\b(19|20)\d{2}\b', pub_info)
+                    year_match = self._YEAR_RE.search(pub_info)
                     if year_match:
                         metadata.year = int(year_match.group(0))
                     
@@ -284,15 +394,13 @@ class GoogleScholarValidator:
                     metadata.publisher = self._clean_text(parts[2])
             
             # Extract snippet/abstract
-            snippet_pattern = r'<div class="gs_rs">(.*?)</div>'
-            snippet_match = re.search(snippet_pattern, first_result)
+            snippet_match = self._SNIPPET_RE.search(first_result)
             if snippet_match:
-                snippet = re.sub(r'<[^>]+>', '', snippet_match.group(1))
+                snippet = self._TAG_RE.sub('', snippet_match.group(1))
                 metadata.abstract = self._clean_text(snippet)
             
             # Extract citation count
-            citation_pattern = r'Cited by (\d+)'
-            citation_match = re.search(citation_pattern, first_result)
+            citation_match = self._CITATION_RE.search(first_result)
             if citation_match:
                 metadata.citations = int(citation_match.group(1))
             
@@ -315,38 +423,32 @@ class GoogleScholarValidator:
     
     def _clean_text(self, text: str) -> str:
         """Clean HTML text."""
-        # Remove HTML entities
-        text = re.sub(r'&[a-z]+;', ' ', text)
-        text = re.sub(r'&#\d+;', ' ', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Decode HTML entities (&amp; -> &, &#8220; -> quote) and collapse
+        # whitespace runs, including the NBSPs &nbsp; turns into
+        return ' '.join(unescape(text).split())
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _title_words(title: str) -> frozenset:
+        """Lowercased words of a title minus stop words (memoized: the same
+        titles recur across retries and batch re-validation)."""
+        return frozenset(title.lower().split()) - GoogleScholarValidator._STOP_WORDS
     
     def _calculate_match_score(self, query_title: str, result_title: str) -> float:
         """Calculate how well result matches query."""
         if not query_title or not result_title:
             return 0.0
         
-        # Normalize
-        query = query_title.lower()
-        result = result_title.lower()
-        
-        # Remove common words
-        stop_words = {'a', 'an', 'the', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'and', 'or'}
-        
-        query_words = set(query.split()) - stop_words
-        result_words = set(result.split()) - stop_words
+        # Normalize and remove common words
+        query_words = self._title_words(query_title)
+        result_words = self._title_words(result_title)
         
         if not query_words or not result_words:
             return 0.0
         
-        # Jaccard similarity
-        intersection = len(query_words.intersection(result_words))
-        union = len(query_words.union(result_words))
-        
-        return intersection / union if union > 0 else 0.0
+        # Jaccard similarity (both sets are non-empty, so the union is too)
+        intersection = len(query_words & result_words)
+        return intersection / (len(query_words) + len(result_words) - intersection)
 
 
 # Global instance
@@ -368,6 +470,20 @@ def validate_paper_scholar(title: str, authors: str = "", year: int = 0) -> Scho
     return google_scholar_validator.search_paper(title, authors, year)
 
 
+def validate_papers_scholar(queries: List[Tuple[str, str, int]], max_workers: int = 2) -> List[ScholarMetadata]:
+    """
+    Convenience function to validate several papers via Google Scholar.
+    
+    Args:
+        queries: (title, authors, year) tuples
+        max_workers: Number of threads issuing searches (requests stay rate-limited)
+        
+    Returns:
+        ScholarMetadata objects in the same order as queries
+    """
+    return google_scholar_validator.search_papers(queries, max_workers)
+
+
 
 
 
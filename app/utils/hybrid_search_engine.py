@@ -3,8 +3,12 @@ Hybrid Search Engine combining Semantic and Keyword Search
 Provides the best of both worlds for research paper search.
 """
 
+import bisect
+import heapq
 import logging
-from typing import List, Dict, Any, Tuple
+import time
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Optional
 from .semantic_search_engine import SemanticSearchEngine
 from ..database_unified import get_unified_paper_repository
 
@@ -14,6 +18,10 @@ logger = logging.getLogger(__name__)
 class HybridSearchEngine:
     """Hybrid search engine combining semantic and keyword search."""
     
+    # Seconds a cached paper list is reused even when no write was seen
+    # (guards against changes made by another process)
+    PAPERS_CACHE_TTL = 60.0
+    
     def __init__(self, paper_repo=None):
         """
         Initialize the hybrid search engine.
@@ -23,6 +31,34 @@ class HybridSearchEngine:
         """
         self.paper_repo = paper_repo or get_unified_paper_repository()
         self.semantic_engine = SemanticSearchEngine(self.paper_repo)
+        
+        # (data version, load time) of the cached paper data: the paper count
+        # and the sorted title/abstract vocabulary used for prefix suggestions
+        self._papers_cache_key: Optional[Tuple[int, float]] = None
+        self._paper_count = 0
+        self._vocab: List[str] = []
+    
+    def _refresh_papers_cache(self) -> None:
+        """Rebuild the paper data when the database changed or the TTL expired."""
+        version = self.paper_repo.db_manager.data_version
+        now = time.monotonic()
+        if (self._papers_cache_key is not None and self._papers_cache_key[0] == version
+                and now - self._papers_cache_key[1] < self.PAPERS_CACHE_TTL):
+            return
+        
+        # Only the count and vocabulary are kept, not the paper rows themselves
+        papers = self.paper_repo.list_all()
+        self._paper_count = len(papers)
+        # Suggestions are longer than the (2+ character) query, so shorter
+        # words can never be returned
+        self._vocab = sorted({
+            word
+            for paper in papers
+            for field in ('title', 'abstract')
+            for word in (paper.get(field) or '').lower().split()
+            if len(word) > 2
+        })
+        self._papers_cache_key = (version, now)
     
     def search(self, query: str, 
                search_type: str = "hybrid",
@@ -63,11 +99,7 @@ class HybridSearchEngine:
                 semantic_results = self.semantic_engine.search(query, top_k * 2, semantic_threshold)
                 keyword_results = self._keyword_search(query, top_k * 2)
                 
-                # Normalize scores
-                semantic_results = self._normalize_scores(semantic_results)
-                keyword_results = self._normalize_scores(keyword_results)
-                
-                # Combine results
+                # Normalize and combine results in one pass
                 results = self._combine_results(
                     semantic_results, keyword_results,
                     semantic_weight, keyword_weight, top_k
@@ -92,85 +124,45 @@ class HybridSearchEngine:
             List of (paper, score) tuples
         """
         try:
-            # Get all papers
-            papers = self.paper_repo.list_all()
-            
-            if not papers:
-                return []
-            
-            # Simple keyword matching
-            query_lower = query.lower()
-            results = []
-            
-            for paper in papers:
-                score = 0.0
-                
-                # Check title
-                title = paper.get('title', '')
-                if query_lower in title.lower():
-                    score += 2.0  # Higher weight for title matches
-                
-                # Check abstract
-                abstract = paper.get('abstract', '')
-                if query_lower in abstract.lower():
-                    score += 1.0  # Lower weight for abstract matches
-                
-                # Check authors
-                authors = paper.get('authors', '')
-                if query_lower in authors.lower():
-                    score += 0.5  # Lower weight for author matches
-                
-                # Check journal
-                journal = paper.get('journal', '')
-                if query_lower in journal.lower():
-                    score += 0.5  # Lower weight for journal matches
-                
-                if score > 0:
-                    results.append((paper, score))
-            
-            # Sort by score and return top_k
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:top_k]
+            # Matching, weighting (title 2.0, abstract 1.0, authors and
+            # journal 0.5) and top_k selection all happen in one SQL query
+            return self.paper_repo.keyword_search(query, top_k)
             
         except Exception as e:
             logger.error(f"Error in keyword search: {e}")
             return []
     
-    def _normalize_scores(self, results: List[Tuple[Any, float]]) -> List[Tuple[Any, float]]:
+    def _score_range(self, results: List[Tuple[Any, float]]) -> Tuple[float, float]:
         """
-        Normalize scores to 0-1 range.
+        Get the offset and span that normalize scores to the 0-1 range.
         
         Args:
             results: List of (paper, score) tuples
             
         Returns:
-            List of (paper, normalized_score) tuples
+            (min_score, max_score - min_score), or (0.0, 1.0) to keep the
+            scores as they are when there is nothing to spread
         """
         if not results:
-            return []
+            return 0.0, 1.0
         
         scores = [score for _, score in results]
         min_score = min(scores)
         max_score = max(scores)
         
         if max_score == min_score:
-            # All scores are the same, return as is
-            return results
-        
-        # Normalize to 0-1 range
-        normalized_results = []
-        for paper, score in results:
-            normalized_score = (score - min_score) / (max_score - min_score)
-            normalized_results.append((paper, normalized_score))
+            # All scores are the same, keep them as is
+            return 0.0, 1.0
         
-        return normalized_results
+        return min_score, max_score - min_score
     
     def _combine_results(self, semantic_results: List[Tuple[Any, float]], 
                         keyword_results: List[Tuple[Any, float]],
                         semantic_weight: float, keyword_weight: float,
                         top_k: int) -> List[Tuple[Any, float]]:
         """
-        Combine semantic and keyword search results.
+        Combine semantic and keyword search results, normalizing each
+        engine's scores to the 0-1 range on the way.
         
         Args:
             semantic_results: Semantic search results
@@ -182,46 +174,29 @@ class HybridSearchEngine:
         Returns:
             Combined results sorted by combined score
         """
-        # Create a dictionary to store combined scores
-        combined_scores = {}
+        # Combined score and paper per id; insertion order breaks score ties
+        # the same way the stable sort did
+        semantic_parts: Dict[Any, float] = {}
+        combined_scores: Dict[Any, float] = {}
+        papers: Dict[Any, Any] = {}
         
         # Add semantic results
+        offset, span = self._score_range(semantic_results)
         for paper, score in semantic_results:
             paper_id = paper.get('id')
-            combined_scores[paper_id] = {
-                'paper': paper,
-                'semantic_score': score,
-                'keyword_score': 0.0,
-                'combined_score': score * semantic_weight
-            }
+            papers[paper_id] = paper
+            semantic_parts[paper_id] = combined_scores[paper_id] = (score - offset) / span * semantic_weight
         
-        # Add keyword results
+        # Add keyword results (papers only found here have no semantic part)
+        offset, span = self._score_range(keyword_results)
         for paper, score in keyword_results:
             paper_id = paper.get('id')
-            if paper_id in combined_scores:
-                # Paper exists in both results
-                combined_scores[paper_id]['keyword_score'] = score
-                combined_scores[paper_id]['combined_score'] = (
-                    combined_scores[paper_id]['semantic_score'] * semantic_weight +
-                    score * keyword_weight
-                )
-            else:
-                # Paper only in keyword results
-                combined_scores[paper_id] = {
-                    'paper': paper,
-                    'semantic_score': 0.0,
-                    'keyword_score': score,
-                    'combined_score': score * keyword_weight
-                }
+            papers.setdefault(paper_id, paper)
+            combined_scores[paper_id] = semantic_parts.get(paper_id, 0.0) + (score - offset) / span * keyword_weight
         
-        # Sort by combined score and return top_k results
-        sorted_results = sorted(
-            combined_scores.values(),
-            key=lambda x: x['combined_score'],
-            reverse=True
-        )
-        
-        return [(item['paper'], item['combined_score']) for item in sorted_results[:top_k]]
+        # Pick the top_k results by combined score without sorting them all
+        top = heapq.nlargest(top_k, combined_scores.items(), key=itemgetter(1))
+        return [(papers[paper_id], score) for paper_id, score in top]
     
     def find_similar_papers(self, paper_id: int, top_k: int = 5, 
                           threshold: float = 0.3) -> List[Tuple[Any, float]]:
@@ -253,29 +228,18 @@ class HybridSearchEngine:
             if not query or len(query) < 2:
                 return []
             
-            # Get all papers
-            papers = self.paper_repo.list_all()
+            # Cached, sorted vocabulary of all titles and abstracts
+            self._refresh_papers_cache()
             
-            # Extract potential suggestions from titles and abstracts
-            suggestions = set()
+            # Words sharing the query prefix form one contiguous run
+            suggestions = []
             query_lower = query.lower()
-            
-            for paper in papers:
-                # Check title
-                title = paper.get('title', '')
-                if query_lower in title.lower():
-                    words = title.lower().split()
-                    for word in words:
-                        if word.startswith(query_lower) and len(word) > len(query_lower):
-                            suggestions.add(word)
-                
-                # Check abstract
-                abstract = paper.get('abstract', '')
-                if query_lower in abstract.lower():
-                    words = abstract.lower().split()
-                    for word in words:
-                        if word.startswith(query_lower) and len(word) > len(query_lower):
-                            suggestions.add(word)
+            vocab = self._vocab
+            i = bisect.bisect_left(vocab, query_lower)
+            while i < len(vocab) and vocab[i].startswith(query_lower):
+                if len(vocab[i]) > len(query_lower):
+                    suggestions.append(vocab[i])
+                i += 1
             
             # Sort by length (shorter first) and return top_k
             sorted_suggestions = sorted(suggestions, key=len)[:top_k]
@@ -287,9 +251,10 @@ class HybridSearchEngine:
     
     def get_search_stats(self) -> Dict[str, Any]:
         """Get search engine statistics."""
+        self._refresh_papers_cache()
         return {
             'semantic_stats': self.semantic_engine.get_embedding_stats(),
-            'total_papers': len(self.paper_repo.list_all())
+            'total_papers': self._paper_count
         }
 
 
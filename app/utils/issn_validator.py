@@ -6,11 +6,17 @@ Supports: ISSN Portal API and DOAJ API (for open-access journals).
 
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
+import threading
 import time
 
+from .api_cache import APICache
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +45,14 @@ class ISSNMetadata:
 class ISSNValidator:
     """Validate journals and fetch metadata using ISSN."""
     
+    # ISSN patterns (compiled once, used on every extraction)
+    issn_pattern = re.compile(r'\b(\d{4})-(\d{3}[\dXx])\b')
+    # Either an "ISSN:" label followed by the number, or a bare number with a
+    # word boundary on both sides (the (?(1)|\b) conditional only demands the
+    # trailing boundary when no label matched)
+    _ISSN_ANY_RE = re.compile(r'(?:(ISSN[:\s]+)|\b)(\d{4})-(\d{3}[\dXx])(?(1)|\b)', re.IGNORECASE)
+    _ISSN_CLEAN_RE = re.compile(r'[^\dXx]')
+    
     def __init__(self):
         """Initialize ISSN validator."""
         self.session = requests.Session()
@@ -46,6 +60,21 @@ class ISSNValidator:
             'User-Agent': 'ResearchPaperBrowser/2.0 (Educational Project)'
         })
         
+        # Transient failures (connection errors, 429 and 5xx) are retried
+        # inside urllib3 with a short backoff (0s, 1s, 2s), honouring any
+        # Retry-After; the final response still reaches the status checks below.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # Two hosts (DOAJ, ISSN Portal); keep enough kept-alive connections
+        # per host for validate_many's worker threads
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry))
+        
         # API endpoints
         self.issn_portal_url = "https://portal.issn.org/api/search"
         self.doaj_api_url = "https://doaj.org/api/v2/search/journals"
@@ -53,11 +82,10 @@ class ISSNValidator:
         # Rate limiting
         self.rate_limit_delay = 1.0
         self.last_request_time = 0
+        self._rate_limit_lock = threading.Lock()
         
-        # ISSN pattern for extraction
-        self.issn_pattern = re.compile(
-            r'\b(\d{4})-(\d{3}[\dXx])\b'
-        )
+        # Successful lookups keyed by ISSN
+        self._cache = APICache("issn")
     
     def extract_issn_from_text(self, text: str) -> List[str]:
         """
@@ -70,37 +98,15 @@ class ISSNValidator:
             List of ISSN numbers found
         """
         issns = []
+        seen = set()
         
-        # Look for ISSN pattern in first 2000 characters
-        search_text = text[:2000]
-        
-        # Find all ISSN patterns
-        matches = self.issn_pattern.findall(search_text)
-        
-        for match in matches:
-            if isinstance(match, tuple):
-                issn = f"{match[0]}-{match[1]}"
-            else:
-                issn = match
+        # Labeled and bare ISSNs in one pass over the first 2000 characters
+        for match in self._ISSN_ANY_RE.finditer(text, 0, 2000):
+            issn = f"{match.group(2)}-{match.group(3)}"
             
             # Validate ISSN format
-            if self._validate_issn_format(issn):
-                issns.append(issn)
-        
-        # Also look for explicit ISSN labels
-        issn_label_pattern = re.compile(
-            r'ISSN[:\s]+(\d{4})-(\d{3}[\dXx])',
-            re.IGNORECASE
-        )
-        
-        label_matches = issn_label_pattern.findall(search_text)
-        for match in label_matches:
-            if isinstance(match, tuple):
-                issn = f"{match[0]}-{match[1]}"
-            else:
-                issn = match
-            
-            if self._validate_issn_format(issn) and issn not in issns:
+            if issn not in seen and self._validate_issn_format(issn):
+                seen.add(issn)
                 issns.append(issn)
         
         return issns
@@ -116,33 +122,18 @@ class ISSNValidator:
             True if valid ISSN format
         """
         # Remove hyphen for validation
-        issn_digits = issn.replace('-', '').replace('-', '')
+        d = issn.replace('-', '')
         
-        if len(issn_digits) != 8:
+        if len(d) != 8:
             return False
         
-        # Calculate checksum
+        # A valid ISSN's weighted digit sum, check digit included (X = 10),
+        # is divisible by 11
         try:
-            total = 0
-            for i in range(7):
-                digit = int(issn_digits[i])
-                total += digit * (8 - i)
-            
-            checksum = issn_digits[7]
-            if checksum.upper() == 'X':
-                checksum_value = 10
-            else:
-                checksum_value = int(checksum)
-            
-            # Check if valid
-            remainder = total % 11
-            expected = (11 - remainder) % 11
-            if expected == 10:
-                expected = 'X'
-            else:
-                expected = str(expected)
-            
-            return str(checksum_value) == str(expected) or checksum.upper() == expected
+            total = (8 * int(d[0]) + 7 * int(d[1]) + 6 * int(d[2]) + 5 * int(d[3])
+                     + 4 * int(d[4]) + 3 * int(d[5]) + 2 * int(d[6]))
+            check = 10 if d[7] in 'Xx' else int(d[7])
+            return (total + check) % 11 == 0
             
         except ValueError:
             return False
@@ -168,12 +159,17 @@ class ISSNValidator:
                 success=False
             )
         
+        cached = self._cache.get(issn.upper())
+        if cached is not None:
+            return cached
+        
         # Try DOAJ first (open access journals, faster response)
         logger.info(f"Trying DOAJ API for ISSN: {issn}")
         doaj_result = self._fetch_from_doaj(issn)
         
         if doaj_result.success:
             logger.info(f"Found journal in DOAJ: {doaj_result.title}")
+            self._cache.set(issn.upper(), doaj_result)
             return doaj_result
         
         # Fallback to ISSN Portal
@@ -182,6 +178,7 @@ class ISSNValidator:
         
         if portal_result.success:
             logger.info(f"Found journal in ISSN Portal: {portal_result.title}")
+            self._cache.set(issn.upper(), portal_result)
             return portal_result
         
         # Both failed
@@ -191,13 +188,39 @@ class ISSNValidator:
             success=False
         )
     
+    def validate_many(self, issns: List[str], max_workers: int = 4) -> List[ISSNMetadata]:
+        """
+        Validate several journals, overlapping one lookup's network wait with
+        the next one's rate-limit wait. Each distinct ISSN is looked up once.
+        
+        Args:
+            issns: ISSN numbers
+            max_workers: Number of threads issuing lookups (requests stay rate-limited)
+            
+        Returns:
+            ISSNMetadata objects in the same order as issns
+        """
+        # Spellings that clean to the same ISSN share one lookup
+        keys = [self._clean_issn(issn).upper() for issn in issns]
+        unique = {}
+        for key, issn in zip(keys, issns):
+            unique.setdefault(key, issn)
+        
+        if max_workers <= 1 or len(unique) <= 1:
+            results = {key: self.validate_by_issn(issn) for key, issn in unique.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = dict(zip(unique, pool.map(self.validate_by_issn, unique.values())))
+        
+        return [results[key] for key in keys]
+    
     def _clean_issn(self, issn: str) -> str:
         """Clean and format ISSN."""
         if not issn:
             return ""
         
         # Remove all non-digit and non-X characters
-        issn = re.sub(r'[^\dXx]', '', issn)
+        issn = self._ISSN_CLEAN_RE.sub('', issn)
         
         # Ensure 8 characters
         if len(issn) != 8:
@@ -207,14 +230,15 @@ class ISSNValidator:
         return f"{issn[:4]}-{issn[4:]}"
     
     def _respect_rate_limit(self):
-        """Respect API rate limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
+        """Respect API rate limits (safe to call from several threads)."""
+        # Reserve the next request slot under the lock, then wait outside it
+        with self._rate_limit_lock:
+            current_time = time.monotonic()
+            wait = max(0.0, self.last_request_time + self.rate_limit_delay - current_time)
+            self.last_request_time = current_time + wait
         
-        self.last_request_time = time.time()
+        if wait:
+            time.sleep(wait)
     
     def _fetch_from_doaj(self, issn: str) -> ISSNMetadata:
         """
@@ -478,3 +502,15 @@ def extract_issn_from_text(text: str) -> List[str]:
     return issn_validator.extract_issn_from_text(text)
 
 
+def validate_journals_by_issn(issns: List[str], max_workers: int = 4) -> List[ISSNMetadata]:
+    """
+    Convenience function to validate several journals by ISSN.
+    
+    Args:
+        issns: ISSN numbers
+        max_workers: Number of threads issuing lookups (requests stay rate-limited)
+        
+    Returns:
+        ISSNMetadata objects in the same order as issns
+    """
+    return issn_validator.validate_many(issns, max_workers)